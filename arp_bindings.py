@@ -0,0 +1,184 @@
+from arp_stats import AlertCooldown, format_mac, pack_mac
+from collections import OrderedDict
+import json
+import os
+import socket
+
+UNSPECIFIED_IP = bytes(4)
+DEFAULT_MAX_BINDINGS = 65536
+# Gratuitous ARPs from one IP tolerated per window before it counts as a flood
+GARP_FLOOD_THRESHOLD = 10
+GARP_WINDOW = 10
+# IPs one MAC may claim before it looks like spoofing (routers doing proxy ARP may need more)
+MAX_IPS_PER_MAC = 16
+
+
+class Binding:
+    """Current MAC of one IP, with first/last seen times and the gratuitous ARP window."""
+
+    __slots__ = ("ip", "mac", "first_seen", "last_seen", "packets", "garp_window", "garp_count")
+
+    def __init__(self, ip: bytes, mac: bytes, seen: float):
+        self.ip = ip
+        self.mac = mac
+        self.first_seen = seen
+        self.last_seen = seen
+        self.packets = 0
+        self.garp_window = seen
+        self.garp_count = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "ip": socket.inet_ntoa(self.ip),
+            "mac": format_mac(self.mac),
+            "first_seen": round(self.first_seen, 3),
+            "last_seen": round(self.last_seen, 3),
+            "packets": self.packets,
+        }
+
+
+class ArpBindingTable:
+    """IP <-> MAC bindings learnt from ARP traffic, with spoofing/conflict alerts.
+
+    Bindings are indexed both by IP (one Binding each) and by MAC (the set of
+    IPs it claims), so every packet costs a couple of dict operations. The
+    table is capped at `max_bindings` IPs, least recently seen evicted first,
+    and alerts have a per-key cooldown, so an ARP storm can't grow memory or
+    flood the console.
+
+    Alerts:
+        - MAC flip: an IP moves to another MAC (spoofing, failover, DHCP reuse).
+        - Gratuitous ARP flood: one IP announces itself more than GARP_FLOOD_THRESHOLD
+          times in GARP_WINDOW seconds.
+        - MAC claiming many IPs: one MAC bound to more than MAX_IPS_PER_MAC IPs.
+    """
+
+    def __init__(
+        self,
+        max_bindings: int = DEFAULT_MAX_BINDINGS,
+        garp_threshold: int = GARP_FLOOD_THRESHOLD,
+        max_ips_per_mac: int = MAX_IPS_PER_MAC,
+    ):
+        """Initialize an ArpBindingTable object.
+
+        Args:
+            max_bindings (int, optional): Most IPs tracked at once. Defaults to 65536.
+            garp_threshold (int, optional): Gratuitous ARPs per IP and window before alerting. Defaults to 10.
+            max_ips_per_mac (int, optional): IPs per MAC before alerting. Defaults to 16.
+        """
+        self.max_bindings = max_bindings
+        self.garp_threshold = garp_threshold
+        self.max_ips_per_mac = max_ips_per_mac
+        self.by_ip = OrderedDict()
+        self.by_mac = {}
+        self.alerts = AlertCooldown(max_bindings)
+
+    def __len__(self) -> int:
+        return len(self.by_ip)
+
+    def lookup_ip(self, ip: str):
+        """Binding of an IP, or None."""
+        return self.by_ip.get(socket.inet_aton(ip))
+
+    def lookup_mac(self, mac: str) -> list:
+        """IPs currently bound to a MAC."""
+        return sorted(socket.inet_ntoa(ip) for ip in self.by_mac.get(pack_mac(mac), ()))
+
+    def _unbind(self, ip: bytes, mac: bytes) -> None:
+        ips = self.by_mac.get(mac)
+        if ips is not None:
+            ips.discard(ip)
+            if not ips:
+                del self.by_mac[mac]
+
+    def observe(self, timestamp: float, op: int, psrc: bytes, pdst: bytes, hwsrc: bytes) -> list:
+        """Learn from one ARP packet, addresses in their packed (wire) form.
+
+        Returns:
+            list: Alert messages raised by this packet (usually empty).
+        """
+        alerts = []
+        # ARP probes (RFC 5227) come from 0.0.0.0 and bind nothing
+        if psrc == UNSPECIFIED_IP:
+            return alerts
+        binding = self.by_ip.get(psrc)
+        if binding is None:
+            binding = Binding(psrc, hwsrc, timestamp)
+            self.by_ip[psrc] = binding
+            self.by_mac.setdefault(hwsrc, set()).add(psrc)
+            if len(self.by_ip) > self.max_bindings:
+                _, evicted = self.by_ip.popitem(last=False)
+                self._unbind(evicted.ip, evicted.mac)
+        else:
+            self.by_ip.move_to_end(psrc)
+            if binding.mac != hwsrc:
+                self.alerts.alert(
+                    "flip",
+                    psrc,
+                    timestamp,
+                    f"MAC flip: {socket.inet_ntoa(psrc)} moved from {format_mac(binding.mac)} to {format_mac(hwsrc)}",
+                    alerts,
+                )
+                self._unbind(psrc, binding.mac)
+                self.by_mac.setdefault(hwsrc, set()).add(psrc)
+                binding.mac = hwsrc
+        binding.last_seen = timestamp
+        binding.packets += 1
+
+        # Gratuitous ARP: a host announcing its own address
+        if psrc == pdst:
+            if timestamp - binding.garp_window > GARP_WINDOW:
+                binding.garp_window = timestamp
+                binding.garp_count = 0
+            binding.garp_count += 1
+            if binding.garp_count > self.garp_threshold:
+                self.alerts.alert(
+                    "garp",
+                    psrc,
+                    timestamp,
+                    f"Gratuitous ARP flood: {socket.inet_ntoa(psrc)} ({format_mac(hwsrc)}) "
+                    f"sent {binding.garp_count} in {GARP_WINDOW}s",
+                    alerts,
+                )
+
+        claimed = len(self.by_mac.get(hwsrc, ()))
+        if claimed > self.max_ips_per_mac:
+            self.alerts.alert(
+                "claims",
+                hwsrc,
+                timestamp,
+                f"{format_mac(hwsrc)} claims {claimed} IPs",
+                alerts,
+            )
+        return alerts
+
+    def snapshot(self) -> list:
+        return [binding.as_dict() for binding in self.by_ip.values()]
+
+    def save(self, path: str) -> None:
+        """Write the bindings as JSON, atomically so the GUI never reads half a file.
+
+        [EXAMPLE]:
+            {"bindings": [{"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:ff",
+                           "first_seen": 1700000000.123, "last_seen": 1700000456.789, "packets": 42}]}
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as bindings_file:
+            json.dump({"bindings": self.snapshot()}, bindings_file, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "ArpBindingTable":
+        table = cls(**kwargs)
+        with open(path) as bindings_file:
+            bindings = json.load(bindings_file)["bindings"]
+        # Oldest first, so the eviction order survives the round trip
+        for saved in sorted(bindings, key=lambda saved: saved["last_seen"]):
+            ip = socket.inet_aton(saved["ip"])
+            mac = pack_mac(saved["mac"])
+            binding = Binding(ip, mac, saved["first_seen"])
+            binding.last_seen = saved["last_seen"]
+            binding.packets = saved["packets"]
+            table.by_ip[ip] = binding
+            table.by_mac.setdefault(mac, set()).add(ip)
+        return table
@@ -0,0 +1,174 @@
+from arp_stats import AlertCooldown
+from array import array
+from collections import OrderedDict
+import heapq
+import socket
+
+DEFAULT_BUCKETS = 300
+DEFAULT_MAX_SOURCES = 1024
+# Global ARP requests per second that count as a broadcast storm
+STORM_THRESHOLD = 500
+# Requests per second, or per window, from one source that look like a sweep
+SCAN_RATE_THRESHOLD = 20
+SCAN_WINDOW_THRESHOLD = 256
+
+
+class RateRing:
+    """Event counts in 1 second buckets over the last `buckets` seconds.
+
+    The ring is one preallocated array and a running total of the whole
+    window is kept alongside, so counting an event is O(1) and the window
+    total never needs a sum. Buckets that fall out of the window are zeroed
+    as time moves forward (at most `buckets` of them, however long the gap).
+    """
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS):
+        self.counts = array("I", bytes(4 * buckets))
+        self.current = None
+        self.total = 0
+
+    def advance(self, second: int) -> None:
+        """Move the ring forward to `second`, dropping the buckets that left the window."""
+        if self.current is None:
+            self.current = second
+            return None
+        size = len(self.counts)
+        for step in range(1, min(second - self.current, size) + 1):
+            index = (self.current + step) % size
+            self.total -= self.counts[index]
+            self.counts[index] = 0
+        self.current = max(self.current, second)
+
+    def add(self, timestamp: float, amount: int = 1) -> int:
+        """Count events at `timestamp`.
+
+        Returns:
+            int: Events counted in that timestamp's second so far (0 if it is already out of the window).
+        """
+        second = int(timestamp)
+        self.advance(second)
+        if second <= self.current - len(self.counts):
+            return 0
+        index = second % len(self.counts)
+        self.counts[index] += amount
+        self.total += amount
+        return self.counts[index]
+
+    def rate(self, seconds: int = None, now: float = None) -> float:
+        """Average events per second over the last `seconds` (the whole window by default)."""
+        size = len(self.counts)
+        seconds = size if seconds is None else min(seconds, size)
+        if now is not None:
+            self.advance(int(now))
+        if self.current is None or seconds <= 0:
+            return 0.0
+        if seconds == size:
+            return self.total / size
+        total = sum(self.counts[(self.current - step) % size] for step in range(seconds))
+        return total / seconds
+
+
+class ArpRateTracker:
+    """Sliding-window ARP request rates, globally and per source IP, with storm/scan alerts.
+
+    Every request costs two RateRing updates and a dict lookup. Sources are
+    capped at `max_sources` rings, least recently active evicted first, so
+    memory is fixed even when a storm spoofs thousands of senders.
+
+    Alerts:
+        - Broadcast storm: more than STORM_THRESHOLD requests in one second, all sources.
+        - Scanning host: one source sending more than SCAN_RATE_THRESHOLD requests in one
+          second, or more than SCAN_WINDOW_THRESHOLD over the window (slow sweeps).
+    """
+
+    def __init__(
+        self,
+        buckets: int = DEFAULT_BUCKETS,
+        max_sources: int = DEFAULT_MAX_SOURCES,
+        storm_threshold: int = STORM_THRESHOLD,
+        scan_rate_threshold: int = SCAN_RATE_THRESHOLD,
+        scan_window_threshold: int = SCAN_WINDOW_THRESHOLD,
+    ):
+        """Initialize an ArpRateTracker object.
+
+        Args:
+            buckets (int, optional): Window length in seconds. Defaults to 300.
+            max_sources (int, optional): Most source IPs tracked at once. Defaults to 1024.
+            storm_threshold (int, optional): Global requests per second. Defaults to 500.
+            scan_rate_threshold (int, optional): Requests per second from one source. Defaults to 20.
+            scan_window_threshold (int, optional): Requests per window from one source. Defaults to 256.
+        """
+        self.buckets = buckets
+        self.max_sources = max_sources
+        self.storm_threshold = storm_threshold
+        self.scan_rate_threshold = scan_rate_threshold
+        self.scan_window_threshold = scan_window_threshold
+        self.requests = RateRing(buckets)
+        self.sources = OrderedDict()
+        self.alerts = AlertCooldown(max_sources)
+        self.last_seen = None
+
+    def source_ring(self, psrc: bytes) -> RateRing:
+        ring = self.sources.get(psrc)
+        if ring is None:
+            ring = RateRing(self.buckets)
+            self.sources[psrc] = ring
+            if len(self.sources) > self.max_sources:
+                self.sources.popitem(last=False)
+        else:
+            self.sources.move_to_end(psrc)
+        return ring
+
+    def observe(self, timestamp: float, op: int, psrc: bytes) -> list:
+        """Count one ARP packet (only requests are rated), source in packed form.
+
+        Returns:
+            list: Alert messages raised by this packet (usually empty).
+        """
+        alerts = []
+        self.last_seen = timestamp if self.last_seen is None else max(self.last_seen, timestamp)
+        if op != 1:
+            return alerts
+        per_second = self.requests.add(timestamp)
+        if per_second > self.storm_threshold:
+            self.alerts.alert(
+                "storm",
+                b"",
+                timestamp,
+                f"ARP storm: {per_second} requests in one second",
+                alerts,
+            )
+        ring = self.source_ring(psrc)
+        source_per_second = ring.add(timestamp)
+        if source_per_second > self.scan_rate_threshold or ring.total > self.scan_window_threshold:
+            self.alerts.alert(
+                "scan",
+                psrc,
+                timestamp,
+                f"Possible ARP scan from {socket.inet_ntoa(psrc)}: {source_per_second} requests/s, "
+                f"{ring.total} in {self.buckets}s",
+                alerts,
+            )
+        return alerts
+
+    def summary(self, now: float = None, top: int = 5) -> dict:
+        """Global request rates over 1s/60s/window and the busiest sources over the window.
+
+        Args:
+            now (float, optional): Reference time. Defaults to the last packet seen, so offline captures read right.
+            top (int, optional): How many sources to list. Defaults to 5.
+
+        Returns:
+            dict: rate_1s, rate_60s, rate_window (requests/s) and top_sources, a list of (ip, requests in the window).
+        """
+        if now is None:
+            now = self.last_seen
+        for ring in self.sources.values():
+            ring.rate(0, now)  # Only drops the buckets that left the window
+        sources = heapq.nlargest(top, self.sources.items(), key=lambda item: item[1].total)
+        return {
+            "rate_1s": self.requests.rate(1, now),
+            "rate_60s": self.requests.rate(60, now),
+            "rate_window": self.requests.rate(now=now),
+            "top_sources": [(socket.inet_ntoa(psrc), ring.total) for psrc, ring in sources if ring.total],
+        }
@@ -0,0 +1,103 @@
+import socket
+import struct
+
+# timestamp, op, psrc, pdst, hwsrc: 23 bytes per ARP packet
+ARP_RECORD = struct.Struct("!dB4s4s6s")
+DEFAULT_RING_SIZE = 10000
+# Seconds before the same alert is raised again for the same key
+ALERT_COOLDOWN = 60
+
+
+def format_mac(mac: bytes) -> str:
+    return ":".join(f"{byte:02x}" for byte in mac)
+
+
+def pack_mac(mac: str) -> bytes:
+    return bytes.fromhex(mac.replace(":", "").replace("-", ""))
+
+
+class AlertCooldown:
+    """Raises each (kind, key) alert at most once per `cooldown` seconds.
+
+    At most `max_keys` alerts are remembered, the whole memory is dropped
+    when full, so a storm of distinct keys can't grow it.
+    """
+
+    def __init__(self, max_keys: int, cooldown: float = ALERT_COOLDOWN):
+        self.max_keys = max_keys
+        self.cooldown = cooldown
+        self.alerted = {}
+
+    def alert(self, kind: str, key: bytes, now: float, message: str, alerts: list) -> None:
+        """Append `message` to `alerts` unless the same alert was raised less than `cooldown` ago."""
+        last = self.alerted.get((kind, key))
+        if last is not None and now - last < self.cooldown:
+            return None
+        if len(self.alerted) >= self.max_keys:
+            self.alerted.clear()
+        self.alerted[(kind, key)] = now
+        alerts.append(message)
+
+
+class ArpRecordRing:
+    """Fixed-size ring buffer of the most recent ARP packets as packed records.
+
+    Records live in one preallocated bytearray and the oldest one is
+    overwritten once the ring is full, so the ring costs
+    capacity x ARP_RECORD.size bytes for the whole capture.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_RING_SIZE):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * ARP_RECORD.size)
+        self.next_index = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, op: int, psrc: bytes, pdst: bytes, hwsrc: bytes) -> None:
+        ARP_RECORD.pack_into(
+            self.buffer, self.next_index * ARP_RECORD.size, timestamp, op, psrc, pdst, hwsrc
+        )
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def __iter__(self):
+        """Yield (timestamp, op, psrc, pdst, hwsrc) records, oldest first, decoded to strings."""
+        first = (self.next_index - self.count) % self.capacity
+        for offset in range(self.count):
+            index = (first + offset) % self.capacity
+            timestamp, op, psrc, pdst, hwsrc = ARP_RECORD.unpack_from(
+                self.buffer, index * ARP_RECORD.size
+            )
+            yield timestamp, op, socket.inet_ntoa(psrc), socket.inet_ntoa(pdst), format_mac(hwsrc)
+
+
+class ArpStats:
+    """Flat-memory ARP capture statistics: per-op counters and a ring of recent records."""
+
+    def __init__(self, ring_size: int = DEFAULT_RING_SIZE):
+        """Initialize an ArpStats object.
+
+        Args:
+            ring_size (int, optional): How many recent packets to keep. Defaults to 10000.
+        """
+        self.requests = 0
+        self.replies = 0
+        self.other = 0
+        self.recent = ArpRecordRing(ring_size)
+
+    @property
+    def total(self) -> int:
+        return self.requests + self.replies + self.other
+
+    def add(self, timestamp: float, op: int, psrc: bytes, pdst: bytes, hwsrc: bytes) -> None:
+        """Count one ARP packet, addresses in their packed (wire) form."""
+        if op == 1:
+            self.requests += 1
+        elif op == 2:
+            self.replies += 1
+        else:
+            self.other += 1
+        self.recent.append(timestamp, op, psrc, pdst, hwsrc)
@@ -0,0 +1,124 @@
+from scan_results import ResultSink
+import asyncio
+import errno
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_CONCURRENCY = 1000
+# File descriptors kept free for stdout, logging, the event loop itself...
+FD_RESERVE = 64
+
+
+def fd_limit_concurrency(requested: int = DEFAULT_CONCURRENCY) -> int:
+    """Cap the number of simultaneous connects to what the fd limit allows.
+
+    The soft RLIMIT_NOFILE is raised towards the hard limit first, when the
+    platform allows it.
+
+    Args:
+        requested (int, optional): Wanted concurrency. Defaults to 1000.
+
+    Returns:
+        int: Concurrency that will not run out of file descriptors.
+    """
+    if resource is None:
+        return min(requested, 512 - FD_RESERVE)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = requested + FD_RESERVE
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        new_soft = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            soft = new_soft
+        except (ValueError, OSError):
+            pass
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - FD_RESERVE))
+
+
+async def connect_probe(dst: str, port: int, timeout: float) -> str:
+    """Try a full TCP handshake against dst:port.
+
+    Returns:
+        str: "open", "closed" (refused) or "filtered" (timed out / unreachable).
+    """
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(dst, port), timeout=timeout
+        )
+    except ConnectionRefusedError:
+        return "closed"
+    except asyncio.TimeoutError:
+        return "filtered"
+    except OSError as e:
+        if e.errno in (errno.EMFILE, errno.ENFILE):
+            raise
+        return "filtered"
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return "open"
+
+
+async def connect_scan(
+    probes,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = 1,
+    on_result=None,
+    sink: ResultSink = None,
+    cancelled=None,
+) -> ResultSink:
+    """Unprivileged TCP connect() scan of every (dst, port) probe.
+
+    A fixed pool of workers pulls probes from the shared iterator, so at most
+    `concurrency` sockets are open at once and the probe list is never
+    materialized.
+
+    Args:
+        probes (iterable): (dst, port) tuples to probe.
+        concurrency (int, optional): Simultaneous connection attempts, capped by the fd limit. Defaults to 1000.
+        timeout (float, optional): Seconds per connection attempt. Defaults to 1.
+        on_result (callable, optional): Called as on_result(dst, port, state) for every probe.
+        sink (ResultSink, optional): Where results are recorded. An in-memory one is created if not provided.
+        cancelled (threading.Event, optional): Workers stop taking new probes once set.
+
+    Returns:
+        ResultSink: The sink every probe outcome was recorded into.
+    """
+    sink = sink if sink is not None else ResultSink()
+    probes = iter(probes)
+    concurrency = fd_limit_concurrency(concurrency)
+
+    async def worker():
+        for dst, port in probes:
+            if cancelled is not None and cancelled.is_set():
+                return
+            while True:
+                started = time.monotonic()
+                try:
+                    state = await connect_probe(dst, port, timeout)
+                    break
+                except OSError as e:
+                    # Out of descriptors despite the cap (other threads, ...): back off and retry
+                    if e.errno not in (errno.EMFILE, errno.ENFILE):
+                        raise
+                    await asyncio.sleep(0.05)
+            rtt = time.monotonic() - started if state != "filtered" else None
+            sink.add(dst, port, "TCP", state, rtt)
+            if on_result:
+                on_result(dst, port, state)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sink
+
+
+def run_connect_scan(probes, **kwargs) -> ResultSink:
+    """Blocking wrapper around connect_scan for the CLI."""
+    return asyncio.run(connect_scan(probes, **kwargs))
@@ -0,0 +1,245 @@
+from scapy.all import ARP, Ether, conf, get_if_hwaddr, srp
+from arp_stats import format_mac
+from rate_limiter import TokenBucket
+from collections import deque
+import os
+import queue
+import select
+import socket
+import struct
+import threading
+import time
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP_HEADER = struct.Struct("!BBHHH")
+ETH_P_ARP = 0x0806
+ARP_REQUEST = 1
+ARP_REPLY = 2
+# Ethernet header + ARP who-has/is-at for IPv4 over Ethernet, 42 bytes
+ARP_FRAME = struct.Struct("!6s6sHHHBBH6s4s6s4s")
+ARP_TARGET_IP_OFFSET = 38
+BROADCAST_MAC = b"\xff" * 6
+# Larger target sets are never a single broadcast domain, don't bother routing them all
+ARP_MAX_TARGETS = 65536
+# ARP requests sent back to back before `rate` applies, a /22 goes out in one burst
+ARP_BURST = 1024
+
+
+def icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def echo_request(ident: int, seq: int, payload: bytes = b"noc_scanner") -> bytes:
+    header = ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def icmp_sweep(targets, timeout: float = 1, rate: float = None, cancelled: threading.Event = None):
+    """Ping many hosts at once over one raw ICMP socket.
+
+    Every echo request shares the same identifier and carries the target's
+    index as its sequence number, so a single receiver thread can match any
+    reply to its request. Live hosts are yielded as soon as they answer,
+    the whole sweep costs roughly one timeout window. Targets left unanswered
+    for `timeout` are forgotten, so a TargetSet of millions of addresses only
+    keeps the last timeout window of requests in memory.
+
+    Args:
+        targets (iterable): Target IPs to sweep.
+        timeout (float, optional): Seconds to wait for replies after the last request. Defaults to 1.
+        rate (float, optional): Maximum echo requests per second. Unpaced if not provided.
+        cancelled (threading.Event, optional): Stops the sweep, without waiting for replies, once set.
+
+    Yields:
+        str: IP of every host that answered.
+    """
+    cancelled = cancelled if cancelled is not None else threading.Event()
+    ident = os.getpid() & 0xFFFF
+    pending = {}
+    # (sent_at, target) in send order, to expire unanswered targets
+    sent = deque()
+    live_hosts = queue.Queue()
+    done_sending = threading.Event()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+
+    def receive():
+        deadline = None
+        while (deadline is None or time.monotonic() < deadline) and not cancelled.is_set():
+            if deadline is None and done_sending.is_set():
+                deadline = time.monotonic() + timeout
+            readable, _, _ = select.select([sock], [], [], 0.05)
+            if not readable:
+                continue
+            data, (src, _) = sock.recvfrom(65535)
+            ihl = (data[0] & 0x0F) * 4
+            icmp_type, _, _, reply_ident, reply_seq = ICMP_HEADER.unpack_from(data, ihl)
+            if icmp_type != ICMP_ECHO_REPLY or reply_ident != ident:
+                continue
+            if pending.get(src) == reply_seq:
+                pending.pop(src, None)
+                live_hosts.put(src)
+        live_hosts.put(None)
+
+    limiter = TokenBucket(rate) if rate else None
+    receiver = threading.Thread(target=receive, daemon=True)
+    receiver.start()
+    try:
+        for index, target in enumerate(targets):
+            if cancelled.is_set():
+                break
+            if limiter:
+                limiter.acquire()
+            seq = index & 0xFFFF
+            now = time.monotonic()
+            while sent and sent[0][0] < now - timeout:
+                pending.pop(sent.popleft()[1], None)
+            pending[target] = seq
+            sent.append((now, target))
+            try:
+                sock.sendto(echo_request(ident, seq), (target, 0))
+            except OSError as e:
+                print(f"[ERROR]: {target}: {e}")
+            while not live_hosts.empty():
+                yield live_hosts.get()
+        done_sending.set()
+        while (host := live_hosts.get()) is not None:
+            yield host
+    finally:
+        done_sending.set()
+        receiver.join()
+        sock.close()
+
+
+def arp_interface(targets) -> str:
+    """Interface every target is directly reachable on, or None.
+
+    ARP only works on-link: all targets must route over the same non-loopback
+    interface without a gateway.
+    """
+    if len(targets) > ARP_MAX_TARGETS:
+        return None
+    interfaces = set()
+    for target in targets:
+        iface, _, gateway = conf.route.route(target)
+        if gateway != "0.0.0.0" or iface == conf.loopback_name:
+            return None
+        interfaces.add(iface)
+        if len(interfaces) > 1:
+            return None
+    return interfaces.pop() if interfaces else None
+
+
+def arp_sweep(
+    targets,
+    iface: str = None,
+    timeout: float = 0.5,
+    rate: float = None,
+    cancelled: threading.Event = None,
+    burst: int = ARP_BURST,
+):
+    """Discover on-link hosts with one burst of ARP who-has requests.
+
+    On Linux every request is a precompiled 42 byte frame with only the
+    target IP patched in, sent back to back over one AF_PACKET socket while
+    a receiver thread on the same socket collects the is-at replies, so a /22
+    costs a few milliseconds of sending plus the timeout window. Past the
+    first `burst` requests the sweep is paced at `rate`: broadcasts to a
+    larger segment hit every host on it, so they are held to the scan rate
+    even though it makes the sweep slower. Other platforms fall back to a
+    single batched scapy srp() call.
+
+    Args:
+        targets (iterable): On-link target IPs (see arp_interface).
+        iface (str, optional): Interface to sweep on. Defaults to the one routing the first target.
+        timeout (float, optional): Seconds to wait for replies after the last request. Defaults to 0.5.
+        rate (float, optional): Maximum requests per second after the burst. Unpaced if not provided.
+        cancelled (threading.Event, optional): Stops the sweep, without waiting for replies, once set.
+        burst (int, optional): Requests sent before `rate` applies. Defaults to 1024.
+
+    Yields:
+        tuple: (ip, mac) of every host that answered.
+    """
+    cancelled = cancelled if cancelled is not None else threading.Event()
+    targets = list(targets)
+    if not targets or cancelled.is_set():
+        return
+    route_iface, source, _ = conf.route.route(targets[0])
+    iface = iface or route_iface
+    if not hasattr(socket, "AF_PACKET"):
+        answered, _ = srp(
+            Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=targets),
+            iface=iface,
+            timeout=timeout,
+            inter=1 / rate if rate and len(targets) > burst else 0,
+            verbose=False,
+        )
+        for _, reply in answered:
+            yield reply.psrc, reply.hwsrc
+        return
+
+    source_mac = bytes.fromhex(get_if_hwaddr(iface).replace(":", ""))
+    source_ip = socket.inet_aton(source)
+    frame = bytearray(
+        ARP_FRAME.pack(
+            BROADCAST_MAC, source_mac, ETH_P_ARP,
+            1, 0x0800, 6, 4, ARP_REQUEST,
+            source_mac, source_ip, bytes(6), bytes(4),
+        )
+    )
+    pending = set()
+    live_hosts = queue.Queue()
+    done_sending = threading.Event()
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+    sock.bind((iface, ETH_P_ARP))
+
+    def receive():
+        deadline = None
+        while (deadline is None or time.monotonic() < deadline) and not cancelled.is_set():
+            if deadline is None and done_sending.is_set():
+                deadline = time.monotonic() + timeout
+            readable, _, _ = select.select([sock], [], [], 0.05)
+            if not readable:
+                continue
+            data = sock.recv(65535)
+            if len(data) < ARP_FRAME.size:
+                continue
+            *_, opcode, sender_mac, sender_ip, _, target_ip = ARP_FRAME.unpack_from(data)
+            if opcode != ARP_REPLY or target_ip != source_ip:
+                continue
+            if sender_ip in pending:
+                pending.discard(sender_ip)
+                live_hosts.put((socket.inet_ntoa(sender_ip), format_mac(sender_mac)))
+        live_hosts.put(None)
+
+    limiter = TokenBucket(rate, burst=max(burst, 1)) if rate else None
+    receiver = threading.Thread(target=receive, daemon=True)
+    receiver.start()
+    try:
+        for target in targets:
+            if cancelled.is_set():
+                break
+            packed = socket.inet_aton(target)
+            pending.add(packed)
+            frame[ARP_TARGET_IP_OFFSET:ARP_TARGET_IP_OFFSET + 4] = packed
+            if limiter:
+                limiter.acquire()
+            try:
+                sock.send(frame)
+            except OSError as e:
+                print(f"[ERROR]: {target}: {e}")
+            while not live_hosts.empty():
+                yield live_hosts.get()
+        done_sending.set()
+        while (host := live_hosts.get()) is not None:
+            yield host
+    finally:
+        done_sending.set()
+        receiver.join()
+        sock.close()
@@ -0,0 +1,159 @@
+from array import array
+
+# 32 linear sub-buckets per power of two: every bucket is within ~3% of its values
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Largest recordable RTT, in microseconds (about 67 s), bigger samples are clamped
+MAX_MICROS = (1 << 26) - 1
+BUCKET_COUNT = (MAX_MICROS.bit_length() - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+
+def bucket_index(micros: int) -> int:
+    """HDR-style bucket of a value: linear below SUB_BUCKETS, then SUB_BUCKETS per power of two."""
+    micros = min(max(micros, 0), MAX_MICROS)
+    if micros < SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (micros >> shift) - SUB_BUCKETS
+
+
+def bucket_value(index: int) -> float:
+    """Midpoint (in microseconds) of the values falling into bucket `index`."""
+    if index < SUB_BUCKETS:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    low = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class LatencyHistogram:
+    """Fixed size log-bucketed histogram of RTTs.
+
+    The bucket array is allocated once (BUCKET_COUNT 32-bit counters, under
+    3KB) and never grows, whatever the number of samples.
+    """
+
+    def __init__(self):
+        self.counts = array("I", bytes(4 * BUCKET_COUNT))
+        self.total = 0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bucket_index(int(seconds * 1_000_000))] += 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+
+    def clear(self) -> None:
+        self.counts = array("I", bytes(4 * BUCKET_COUNT))
+        self.total = 0
+
+    def percentile(self, percent: float):
+        """Value (in seconds) below which `percent` % of the samples fall, None when empty."""
+        if not self.total:
+            return None
+        rank = max(1, round(self.total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return bucket_value(index) / 1_000_000
+        return None
+
+
+class WindowSlot:
+    """Samples of one slice of a sliding window."""
+
+    def __init__(self):
+        self.slot_id = None
+        self.histogram = LatencyHistogram()
+        self.sent = 0
+        self.received = 0
+        self.jitter_sum = 0.0
+        self.jitter_count = 0
+
+    def reset(self, slot_id: int) -> None:
+        self.slot_id = slot_id
+        self.histogram.clear()
+        self.sent = 0
+        self.received = 0
+        self.jitter_sum = 0.0
+        self.jitter_count = 0
+
+
+class SlidingLatencyWindow:
+    """Latency, jitter and loss of one host over the last `window` seconds.
+
+    The window is a ring of `slots` time slices, each with its own histogram
+    and counters. A slice is recycled in place once it falls out of the
+    window, so memory stays at `slots` histograms no matter how long the
+    monitor runs. Jitter is the mean absolute difference between consecutive
+    RTTs (RFC 3550 style).
+    """
+
+    def __init__(self, window: float = 60, slots: int = 6):
+        """Initialize a SlidingLatencyWindow object.
+
+        Args:
+            window (float, optional): Seconds the statistics cover. Defaults to 60.
+            slots (int, optional): Number of slices the window moves by. Defaults to 6.
+        """
+        self.window = window
+        self.slot_width = window / slots
+        self.slots = [WindowSlot() for _ in range(slots)]
+        self.last_rtt = None
+
+    def slot(self, when: float, create: bool = True) -> WindowSlot:
+        """Slice holding time `when`, recycled if needed. None if it was already recycled."""
+        slot_id = int(when // self.slot_width)
+        slot = self.slots[slot_id % len(self.slots)]
+        if slot.slot_id != slot_id:
+            if not create or (slot.slot_id is not None and slot.slot_id > slot_id):
+                return None
+            slot.reset(slot_id)
+        return slot
+
+    def on_sent(self, sent_at: float) -> None:
+        self.slot(sent_at).sent += 1
+
+    def on_reply(self, sent_at: float, rtt: float) -> None:
+        """Count a reply in the slice its probe was sent in, so loss compares like with like."""
+        slot = self.slot(sent_at, create=False)
+        if slot is None:
+            return None
+        slot.received += 1
+        slot.histogram.record(rtt)
+        if self.last_rtt is not None:
+            slot.jitter_sum += abs(rtt - self.last_rtt)
+            slot.jitter_count += 1
+        self.last_rtt = rtt
+
+    def summary(self, now: float) -> dict:
+        """p50/p99/jitter (seconds) and loss (0..1) over the window ending at `now`.
+
+        The slice being filled is included, probes still waiting on their
+        reply there count as lost until it arrives.
+        """
+        current = int(now // self.slot_width)
+        histogram = LatencyHistogram()
+        sent = received = jitter_count = 0
+        jitter_sum = 0.0
+        for slot in self.slots:
+            if slot.slot_id is None or current - slot.slot_id >= len(self.slots):
+                continue
+            histogram.merge(slot.histogram)
+            sent += slot.sent
+            received += slot.received
+            jitter_sum += slot.jitter_sum
+            jitter_count += slot.jitter_count
+        return {
+            "sent": sent,
+            "received": received,
+            "p50": histogram.percentile(50),
+            "p99": histogram.percentile(99),
+            "jitter": jitter_sum / jitter_count if jitter_count else None,
+            "loss": max(sent - received, 0) / sent if sent else None,
+        }
@@ -1,48 +1,221 @@
 from scapy.all import *
+from arp_stats import ArpStats, format_mac, pack_mac
+from arp_bindings import ArpBindingTable
+from arp_rates import ArpRateTracker
+from pcap_reader import read_pcap, network_payload
 from datetime import datetime
+import argparse
+import ctypes
+import os
+import socket
+import struct
+import time
+
+ETH_P_ALL = 0x0003
+ETH_HEADER_SIZE = 14
+ETHERTYPE_ARP = 0x0806
+ETHERTYPE_ARP_BYTES = ETHERTYPE_ARP.to_bytes(2, "big")
+SO_ATTACH_FILTER = 26
+ARPHRD_LOOPBACK = 772
+# Room for bursts while a frame is being printed
+CAPTURE_BUFFER_BYTES = 8 * 1024 * 1024
+# htype, ptype, hlen, plen, op, sha, spa, tha, tpa
+ARP_HEADER = struct.Struct("!HHBBH6s4s6s4s")
+### Classic BPF for "arp" (tcpdump -dd arp), attached in the kernel so only ARP frames wake us up
+ARP_BPF = (
+    (0x28, 0, 0, 0x0000000C),
+    (0x15, 0, 1, 0x00000806),
+    (0x06, 0, 0, 0x00040000),
+    (0x06, 0, 0, 0x00000000),
+)
+# Seconds between two snapshots of the binding table
+BINDINGS_SAVE_INTERVAL = 30
 
 packet_number = 0
-num_arp_requests = []
-num_arp_replies = []
+### Counters and a fixed ring of recent packets, memory stays flat over long captures
+arp_stats = ArpStats()
+arp_bindings = ArpBindingTable()
+arp_rates = ArpRateTracker()
+bindings_path = None
+next_bindings_save = 0
+
+
+def handle_arp(captured_at: float, op: int, psrc: bytes, pdst: bytes, hwsrc: bytes):
+    """Count and print one ARP packet, addresses in their packed (wire) form."""
+    global packet_number, next_bindings_save
+    packet_number += 1
+    arp_stats.add(captured_at, op, psrc, pdst, hwsrc)
+    alerts = arp_bindings.observe(captured_at, op, psrc, pdst, hwsrc)
+    alerts += arp_rates.observe(captured_at, op, psrc)
+    # Capture time, which is also "now" for live captures but not for offline files
+    timestamp = datetime.fromtimestamp(captured_at).strftime("%Y-%m-%d | %H:%M:%S.%f")[:-3]
+    for alert in alerts:
+        print(f"{packet_number} | {timestamp} | [ALERT]: {alert}")
+    if bindings_path and captured_at >= next_bindings_save:
+        arp_bindings.save(bindings_path)
+        next_bindings_save = captured_at + BINDINGS_SAVE_INTERVAL
+    if op == 1:  # 1 corresponds to ARP request : op = who-has
+        print(
+            f"{packet_number} | {timestamp} | [ARP]: Request ==> {socket.inet_ntoa(psrc)} is asking for {socket.inet_ntoa(pdst)}"
+        )
+        return None
+    elif op == 2:  # 2 corresponds to ARP reply op = is-at
+        print(
+            f"{packet_number} | {timestamp} | [ARP]: Reply <== {format_mac(hwsrc)} is at {socket.inet_ntoa(psrc)}"
+        )
+        return None
+
+
+def print_rates():
+    """ARP request rates as of the last captured packet, with the busiest sources."""
+    rates = arp_rates.summary()
+    print(
+        f"ARP requests/s: {rates['rate_1s']:.0f} (last second), {rates['rate_60s']:.1f} (1 min), "
+        f"{rates['rate_window']:.1f} ({arp_rates.buckets // 60} min)"
+    )
+    for psrc, requests in rates["top_sources"]:
+        print(f"    {psrc}: {requests} requests")
+
+
+def handle_arp_header(captured_at: float, frame, offset: int):
+    """Decode the ARP header at `offset` of a raw frame (memoryview) and handle it."""
+    if len(frame) < offset + ARP_HEADER.size:
+        return None
+    _, ptype, hlen, plen, op, sha, spa, _, tpa = ARP_HEADER.unpack_from(frame, offset)
+    # IPv4 over Ethernet only, like scapy's psrc/pdst/hwsrc fields
+    if ptype != 0x0800 or hlen != 6 or plen != 4:
+        return None
+    return handle_arp(captured_at, op, spa, tpa, sha)
 
 
 def arp_monitor_callback(pkt):
-    global packet_number
     if ARP in pkt:
         arp_pkt = pkt[ARP]
-        packet_number += 1
-        now = datetime.now()
-        timestamp = now.strftime("%Y-%m-%d | %H:%M:%S.%f")[:-3]
-        if arp_pkt.op == 1:  # 1 corresponds to ARP request : op = who-has
-            print(
-                f"{packet_number} | {timestamp} | [ARP]: Request ==> {arp_pkt.psrc} is asking for {arp_pkt.pdst}"
-            )
-            num_arp_requests.append(arp_pkt)
-            return None
-        elif arp_pkt.op == 2:  # 2 corresponds to ARP reply op = is-at
-            print(
-                f"{packet_number} | {timestamp} | [ARP]: Reply <== {arp_pkt.hwsrc} is at {arp_pkt.psrc}"
-            )
-            num_arp_replies.append(arp_pkt)
-            return None
-
-
-def arp_capture():
+        return handle_arp(
+            float(pkt.time),
+            arp_pkt.op,
+            socket.inet_aton(arp_pkt.psrc),
+            socket.inet_aton(arp_pkt.pdst),
+            pack_mac(arp_pkt.hwsrc),
+        )
+
+
+def arp_capture(iface="Ethernet 2"):
     try:
         sniff(
             prn=arp_monitor_callback,
             filter="arp",
-            iface="Ethernet 2",
+            iface=iface,
             store=0,
         )
     except KeyboardInterrupt:
         print("sniff() cancelled by user input")
 
 
+def attach_bpf(sock, instructions) -> None:
+    """Attach a classic BPF program to a socket (SO_ATTACH_FILTER), no libpcap needed."""
+    program = ctypes.create_string_buffer(
+        b"".join(struct.pack("HBBI", *instruction) for instruction in instructions)
+    )
+    # struct sock_fprog {unsigned short len; struct sock_filter *filter;}
+    fprog = struct.pack("HL", len(instructions), ctypes.addressof(program))
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
+
+
+def arp_capture_raw(iface=None):
+    """Linux fast path: read ARP frames straight off an AF_PACKET socket.
+
+    The kernel BPF filter drops everything but ARP before it is copied to
+    user space, and each frame is received into one reused buffer and decoded
+    with a single precompiled struct over a memoryview, instead of a full
+    scapy dissection per frame.
+
+    Args:
+        iface (str, optional): Interface to capture on. Every interface if not provided.
+    """
+    # Protocol 0 receives nothing until bound, so no frame gets queued before the filter is in place.
+    # Every-interface captures can't bind, frames queued before the filter are dropped by ethertype below.
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, 0 if iface else socket.htons(ETH_P_ALL))
+    attach_bpf(sock, ARP_BPF)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, CAPTURE_BUFFER_BYTES)
+    if iface:
+        sock.bind((iface, ETH_P_ALL))
+    frame = bytearray(2048)
+    view = memoryview(frame)
+    try:
+        while True:
+            length, (_, _, packet_type, hardware_type, _) = sock.recvfrom_into(frame)
+            # Loopback hands every frame over twice (outgoing, then incoming), keep one like libpcap
+            if packet_type == socket.PACKET_OUTGOING and hardware_type == ARPHRD_LOOPBACK:
+                continue
+            if frame[12:14] != ETHERTYPE_ARP_BYTES:
+                continue
+            handle_arp_header(time.time(), view[:length], ETH_HEADER_SIZE)
+    except KeyboardInterrupt:
+        print("sniff() cancelled by user input")
+    finally:
+        sock.close()
+
+
+def arp_read_pcap(path: str):
+    """Offline mode: feed the ARP frames of a pcap/pcapng file through the same handling as a live capture."""
+    try:
+        for captured_at, linktype, frame in read_pcap(path):
+            ethertype, offset = network_payload(linktype, frame)
+            if ethertype == ETHERTYPE_ARP:
+                handle_arp_header(captured_at, frame, offset)
+    except KeyboardInterrupt:
+        print("Reading cancelled by user input")
+    except ValueError as e:
+        print(f"[ERROR]: Cannot read [{path}]: {e}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ARP traffic monitor")
+    parser.add_argument(
+        "--iface",
+        help="interface to capture on (default: Ethernet 2 with scapy, every interface with the raw backend)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("auto", "raw", "scapy"),
+        default="auto",
+        help="raw AF_PACKET capture (Linux) or scapy sniff(); auto picks raw when available",
+    )
+    parser.add_argument(
+        "--read",
+        metavar="PCAP_FILE",
+        help="analyze a pcap/pcapng capture file instead of capturing live",
+    )
+    parser.add_argument(
+        "--bindings",
+        metavar="JSON_FILE",
+        help="keep the IP/MAC binding table in JSON_FILE (reloaded on start, saved every 30s and on exit)",
+    )
+    return parser.parse_args()
+
+
 def main():
-    arp_capture()
-    print("Number of ARP Replies:", len(num_arp_replies))
-    print("Number of ARP Requests:", len(num_arp_requests))
+    global arp_bindings, bindings_path
+    args = parse_args()
+    if args.bindings:
+        bindings_path = args.bindings
+        if os.path.exists(bindings_path):
+            arp_bindings = ArpBindingTable.load(bindings_path)
+    use_raw = args.backend == "raw" or (
+        args.backend == "auto" and hasattr(socket, "AF_PACKET")
+    )
+    if args.read:
+        arp_read_pcap(args.read)
+    elif use_raw:
+        arp_capture_raw(args.iface)
+    else:
+        arp_capture(args.iface or "Ethernet 2")
+    if bindings_path:
+        arp_bindings.save(bindings_path)
+    print("Number of ARP Replies:", arp_stats.replies)
+    print("Number of ARP Requests:", arp_stats.requests)
+    print_rates()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+from host_discovery import echo_request, ICMP_HEADER, ICMP_ECHO_REPLY
+from target_sets import TargetSet
+from latency_stats import SlidingLatencyWindow
+import os
+import select
+import socket
+import threading
+import time
+
+
+class LatencyMonitor:
+    """Continuously ping many hosts over one shared raw ICMP socket.
+
+    Every `interval` seconds each host gets one echo request, spread evenly
+    over the interval. All requests carry the same identifier and a global
+    sequence number, so a single receiver thread matches every reply to its
+    request. RTTs land in a SlidingLatencyWindow per host, so memory per host
+    is constant however long the monitor runs; the only other state is the
+    requests still waiting on a reply, at most hosts x timeout / interval.
+    """
+
+    def __init__(self, hosts, interval: float = 1, timeout: float = 2, window: float = 60, slots: int = 6):
+        """Initialize a LatencyMonitor object.
+
+        Args:
+            hosts (iterable): Host IPs to monitor.
+            interval (float, optional): Seconds between two pings of the same host. Defaults to 1.
+            timeout (float, optional): Seconds after which a ping counts as lost. Defaults to 2.
+            window (float, optional): Seconds the reported statistics cover. Defaults to 60.
+            slots (int, optional): Number of slices the window moves by. Defaults to 6.
+        """
+        self.hosts = list(hosts)
+        self.interval = interval
+        self.timeout = timeout
+        self.windows = {host: SlidingLatencyWindow(window, slots) for host in self.hosts}
+        self.ident = os.getpid() & 0xFFFF
+        self.seq = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.sock = None
+
+    def send_round(self) -> None:
+        """Ping every host once, spread over one interval."""
+        gap = self.interval / max(len(self.hosts), 1)
+        next_send = time.monotonic()
+        for host in self.hosts:
+            if self.stopped.is_set():
+                return None
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_send += gap
+            seq = self.seq
+            self.seq = (self.seq + 1) & 0xFFFF
+            sent_at = time.monotonic()
+            with self.lock:
+                self.pending[seq] = (host, sent_at)
+                self.windows[host].on_sent(sent_at)
+            try:
+                self.sock.sendto(echo_request(self.ident, seq), (host, 0))
+            except OSError as e:
+                print(f"[ERROR]: {host}: {e}")
+        self.expire()
+
+    def expire(self) -> None:
+        """Forget requests older than the timeout, they stay counted as lost."""
+        deadline = time.monotonic() - self.timeout
+        with self.lock:
+            for seq, (_, sent_at) in list(self.pending.items()):
+                if sent_at < deadline:
+                    del self.pending[seq]
+
+    def receive(self) -> None:
+        while not self.stopped.is_set():
+            readable, _, _ = select.select([self.sock], [], [], 0.1)
+            if not readable:
+                continue
+            data, (src, _) = self.sock.recvfrom(65535)
+            received_at = time.monotonic()
+            ihl = (data[0] & 0x0F) * 4
+            icmp_type, _, _, reply_ident, reply_seq = ICMP_HEADER.unpack_from(data, ihl)
+            if icmp_type != ICMP_ECHO_REPLY or reply_ident != self.ident:
+                continue
+            with self.lock:
+                sent = self.pending.get(reply_seq)
+                if sent is None or sent[0] != src:
+                    continue
+                del self.pending[reply_seq]
+                host, sent_at = sent
+                self.windows[host].on_reply(sent_at, received_at - sent_at)
+
+    def summary(self) -> dict:
+        """{host: {"sent", "received", "p50", "p99", "jitter", "loss"}} over the sliding window."""
+        now = time.monotonic()
+        with self.lock:
+            return {host: window.summary(now) for host, window in self.windows.items()}
+
+    def run(self, report=None, report_interval: float = 10) -> None:
+        """Ping until stop() is called (or KeyboardInterrupt).
+
+        Args:
+            report (callable, optional): Called with summary() every `report_interval` seconds.
+            report_interval (float, optional): Seconds between reports. Defaults to 10.
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        receiver = threading.Thread(target=self.receive, daemon=True)
+        receiver.start()
+        next_report = time.monotonic() + report_interval
+        try:
+            while not self.stopped.is_set():
+                self.send_round()
+                if report and time.monotonic() >= next_report:
+                    report(self.summary())
+                    next_report = time.monotonic() + report_interval
+        finally:
+            self.stopped.set()
+            receiver.join()
+            self.sock.close()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+def format_ms(seconds) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.2f}"
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{'HOST':<15} {'SENT':>6} {'P50 ms':>9} {'P99 ms':>9} {'JITTER ms':>10} {'LOSS':>7}")
+    for host, stats in summary.items():
+        loss = "-" if stats["loss"] is None else f"{stats['loss']:.1%}"
+        print(
+            f"{host:<15} {stats['sent']:>6} {format_ms(stats['p50']):>9} "
+            f"{format_ms(stats['p99']):>9} {format_ms(stats['jitter']):>10} {loss:>7}"
+        )
+
+
+def input_seconds(prompt: str, default: float) -> float:
+    """Ask for a positive number of seconds, `default` when the answer is empty or not one."""
+    answer = input(prompt).strip()
+    if answer.replace(".", "", 1).isdigit() and float(answer) > 0:
+        return float(answer)
+    if answer:
+        print(f"[ERROR]: [{answer}] is not a positive number of seconds, using {default}")
+    return default
+
+
+def main():
+    hosts = list(TargetSet.parse(input("Please provide the hosts to monitor (IPs, CIDRs or ranges): ")))
+    interval = input_seconds("Please provide the ping interval in seconds [1]: ", 1)
+    window = input_seconds("Please provide the statistics window in seconds [60]: ", 60)
+    monitor = LatencyMonitor(hosts, interval=interval, window=window)
+    try:
+        monitor.run(report=print_summary, report_interval=window / 6)
+    except KeyboardInterrupt:
+        print("User exited code execution")
+    print_summary(monitor.summary())
+
+
+if __name__ == "__main__":
+    main()
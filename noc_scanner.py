@@ -1,9 +1,27 @@
 from scapy.all import *
-from multiprocessing.pool import ThreadPool
-from common_ports import top_100_tcp_ports, top_100_udp_ports
+from common_ports import top_n
+from scan_engine import SynScanner, UdpScanner
+from scan_permutation import ProbePermutation
+from host_discovery import icmp_sweep, arp_interface, arp_sweep
+from connect_scan import run_connect_scan
+from scan_results import ResultSink
+from scan_checkpoint import ScanCheckpoint, encode_ports, decode_ports, drain
+from scan_diff import SnapshotStore, diff_probes, compare
+from scan_sharding import sharded_scan
+from scan_metrics import ScanMetrics, PrometheusTextfile
+from target_sets import TargetSet, read_exclude
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+import argparse
+import asyncio
 import ipaddress
+import random
+import socket
+import threading
 
-open_ports = []
+SCAN_PHASES = (("TCP", SynScanner), ("UDP", UdpScanner))
 
 
 def ping_target(target_ip) -> str:
@@ -16,71 +34,548 @@ def ping_target(target_ip) -> str:
         print(f"[{target_ip}] is offline. Select a new target.")
 
 
-def is_valid_ip(target_ip) -> str:
+def has_raw_sockets() -> bool:
     try:
-        ipaddress.ip_address(target_ip)
-        return target_ip
-    except ValueError:
-        print(f"The provided IP Address[{target_ip}] is not valid.")
+        socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP).close()
+        return True
+    except PermissionError:
+        return False
 
 
-def port_scan(target_port):
-    try:
-        # TCP port scan
-        tcp_packet = IP(dst=target_ip) / TCP(dport=target_port, flags="S")
-        tcp_response = sr(tcp_packet, timeout=1, verbose=False)[0]
-
-        # UDP port scan
-        udp_packet = IP(dst=target_ip) / UDP(dport=target_port)
-        udp_response = sr(udp_packet, timeout=1, verbose=False)[0]
-
-        for sent_packet, received_packet in tcp_response:
-            if received_packet.haslayer(TCP) and received_packet[TCP].flags == 0x12:
-                print(f"[TCP] port [{target_port}] is up!")
-                open_ports.append((target_port, "TCP"))
+def parse_ports(target_ports_input) -> tuple:
+    """Turn the port prompt answer into (tcp_ports, udp_ports)."""
+    if target_ports_input == "ALL":
+        return range(1, 65536), range(1, 65536)
+    elif target_ports_input.startswith("Top ") and target_ports_input[4:].isdigit():
+        # "Top 20" / "Top 100" / "Top 1000": likeliest open ports first
+        n = int(target_ports_input[4:])
+        return top_n("tcp", n), top_n("udp", n)
+    target_ports = [
+        int(port) for port in target_ports_input.split(",") if port.strip().isdigit()
+    ]
+    return target_ports, target_ports
+
+
+def sweep_targets(targets, rate: float = None, cancelled: threading.Event = None):
+    iface = arp_interface(targets)
+    if iface:
+        # Local segment: ARP answers even when ICMP is firewalled, and gives the MACs
+        for target_ip, target_mac in arp_sweep(targets, iface, rate=rate, cancelled=cancelled):
+            print(f"[{target_ip}] is online ({target_mac})")
+            yield target_ip
+        return
+    for target_ip in icmp_sweep(targets, rate=rate, cancelled=cancelled):
+        print(f"[{target_ip}] is online")
+        yield target_ip
+
+
+def stream_probes(live_hosts, target_ports, scanned_hosts, metrics=None):
+    for target_ip in live_hosts:
+        scanned_hosts.append(target_ip)
+        for target_port in target_ports:
+            yield target_ip, target_port
+    # Discovery is over, the total is exact from now on
+    if metrics is not None:
+        metrics.total = len(scanned_hosts) * len(target_ports)
+
+
+def report_result(record) -> None:
+    if record.state == "open":
+        print(f"[{record.proto}] [{record.host}] port [{record.port}] is up!")
+    elif record.state == "closed":
+        print(f"[{record.proto}] [{record.host}] port [{record.port}] is down")
+    else:
+        print(f"[{record.proto}] [{record.host}] port [{record.port}] is {record.state}")
+
+
+def report_change(phase: str, host: str, port: int, state: str) -> None:
+    print(f"[DIFF] [{phase}] [{host}] port [{port}] is newly {state}")
+
+
+def report_progress(snapshot) -> None:
+    eta = "?" if snapshot["eta"] is None else f"{snapshot['eta']:.0f}s"
+    print(
+        f"[PROGRESS] [{snapshot['proto']}] {snapshot['results']}/{snapshot['total'] or '?'} probes done, "
+        f"{snapshot['pps']:.0f} pps, {snapshot['inflight']} in flight, "
+        f"{snapshot['retransmits']} retransmits, {snapshot['timeouts']} timeouts, ETA {eta}"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batched TCP/UDP port scanner")
+    parser.add_argument(
+        "--checkpoint",
+        metavar="STATE_FILE",
+        help="periodically save scan progress to STATE_FILE so it can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="STATE_FILE",
+        help="continue the scan saved in STATE_FILE instead of starting a new one",
+    )
+    parser.add_argument(
+        "--diff",
+        metavar="SNAPSHOT_DIR",
+        help="only recheck previously open ports plus a rotating sample, and report changes",
+    )
+    parser.add_argument(
+        "--bitmaps",
+        metavar="BITMAP_FILE",
+        help="save the open ports as per-host port bitmaps to BITMAP_FILE",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="N",
+        type=int,
+        default=1,
+        help="shard the raw scan across N processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="print scan progress (pps, in-flight probes, retransmits, ETA) every few seconds",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PROM_FILE",
+        help="keep scan metrics in PROM_FILE for the node_exporter textfile collector",
+    )
+    parser.add_argument(
+        "--exclude",
+        metavar="TARGETS",
+        help="IPs, CIDRs or ranges never to scan, comma separated or a file with one per line",
+    )
+    args = parser.parse_args()
+    if args.diff and (args.checkpoint or args.resume):
+        parser.error("--diff cannot be combined with --checkpoint or --resume")
+    return args
+
+
+class Scanner:
+    """One self-contained TCP/UDP port scan: its own config, engines, results and cancel flag.
+
+    Nothing is shared between Scanner objects, so a GUI or a service can run
+    several of them at once in one process, each on a worker thread:
+
+        scanner = Scanner(TargetSet.parse("10.0.0.0/24"), *parse_ports("Top 100"))
+        future = scanner.start()        # concurrent.futures.Future of the ResultSink
+        ...
+        scanner.cancel()
+
+    or consume the results as they arrive from asyncio:
+
+        async for record in Scanner(["10.0.0.1"], [22, 80, 443]):
+            print(record)
+
+    The scan mode follows the config: connect() scan without raw sockets
+    (TCP only, and none of the modes below), diff scan with `diff_dir`,
+    resumable scan with `checkpoint`, sharded scan with `workers` != 1, and
+    the streaming raw scan otherwise. A diff scan
+    only makes sense as a whole run, so it cannot be checkpointed; its
+    changes end up in `changes` and are passed to `on_change` callbacks.
+    """
+
+    def __init__(
+        self,
+        targets,
+        tcp_ports=(),
+        udp_ports=(),
+        rate: float = 1000,
+        output_path: str = None,
+        callbacks=(),
+        telemetry=(),
+        workers: int = 1,
+        checkpoint: ScanCheckpoint = None,
+        diff_dir: str = None,
+        on_change=(),
+    ):
+        """Initialize a Scanner object.
+
+        Args:
+            targets (iterable): Target IPs, or a TargetSet (kept as is, never expanded in memory).
+            tcp_ports (sequence, optional): TCP ports to probe on every live host.
+            udp_ports (sequence, optional): UDP ports to probe on every live host.
+            rate (float, optional): Maximum packets per second. Defaults to 1000.
+            output_path (str, optional): JSONL/CSV file results are streamed to.
+            callbacks (iterable, optional): Called with every ScanRecord, from the scanning threads.
+            telemetry (iterable, optional): Called with every ScanMetrics snapshot.
+            workers (int, optional): Processes to shard the raw scan across, 0 for one per CPU. Defaults to 1.
+            checkpoint (ScanCheckpoint, optional): Periodically save progress there so the scan can be resumed.
+            diff_dir (str, optional): Snapshot directory, switches to a diff scan against the last snapshot.
+            on_change (iterable, optional): Called as on_change(phase, host, port, state) for every port
+                newly "open" or newly "closed" in a diff scan.
+
+        Raises:
+            ValueError: Both `checkpoint` and `diff_dir` are given.
+        """
+        if checkpoint and diff_dir:
+            raise ValueError("Diff scans cannot be checkpointed or resumed")
+        self.targets = targets if isinstance(targets, TargetSet) else list(targets)
+        self.tcp_ports = tcp_ports
+        self.udp_ports = udp_ports
+        self.rate = rate
+        self.telemetry = list(telemetry)
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.diff_dir = diff_dir
+        self.on_change = list(on_change)
+        self.changes = []
+        self.sink = ResultSink(output_path or None, callbacks=callbacks)
+        self.cancelled = threading.Event()
+        self.future = None
+
+    @classmethod
+    def resume(cls, path: str, **kwargs) -> "Scanner":
+        """Scanner continuing the scan checkpointed in `path`.
+
+        Args:
+            path (str): State file written by a scan with a checkpoint.
+            Remaining arguments are passed to Scanner (callbacks, telemetry...).
+        """
+        checkpoint = ScanCheckpoint.load(path)
+        state = checkpoint.state
+        scanner = cls(
+            state["hosts"],
+            decode_ports(state["tcp_ports"]),
+            decode_ports(state["udp_ports"]),
+            state["rate"],
+            state["output_path"],
+            checkpoint=checkpoint,
+            **kwargs,
+        )
+        scanner.sink.restore(state["open_ports"], state["counts"])
+        return scanner
+
+    def engine(self, scanner_class):
+        """A fresh ProbeScanner of this scan, sharing its sink and cancel flag."""
+        return scanner_class(
+            rate=self.rate,
+            sink=self.sink,
+            metrics=ScanMetrics(self.telemetry, 5),
+            cancelled=self.cancelled,
+        )
+
+    def discover(self):
+        """Live hosts among the targets, streamed as they answer."""
+        if len(self.targets) == 1:
+            ping_target(self.targets[0])
+            yield from self.targets
+            return
+        # One raw socket sweep paced like the scan past an ARP burst, live hosts stream out as they answer
+        yield from sweep_targets(self.targets, self.rate, self.cancelled)
+
+    def run(self) -> ResultSink:
+        """Run the whole scan in the calling thread.
+
+        Returns:
+            ResultSink: The (closed) sink with every result of the scan.
+
+        Raises:
+            ValueError: Raw sockets are unavailable and the config needs them (see connect_scan).
+        """
+        try:
+            if not has_raw_sockets():
+                self.connect_scan()
+            elif self.diff_dir:
+                self.diff_scan()
+            elif self.checkpoint:
+                self.resumable_scan()
+            elif self.workers != 1:
+                self.multiprocess_scan()
             else:
-                print(f"[TCP] port [{target_port}] is down")
+                self.raw_scan()
+        finally:
+            self.sink.close()
+        return self.sink
 
-        for sent_packet, received_packet in udp_response:
-            if received_packet.haslayer(UDP):
-                print(f"[UDP] port [{target_port}] is up!")
-                open_ports.append((target_port, "UDP"))
+    def start(self, executor=None) -> Future:
+        """Run the scan in the background.
 
-    except Exception as e:
-        print(f"[ERROR]: {e}")
+        Args:
+            executor (concurrent.futures.Executor, optional): Where to run it. A dedicated thread if not provided.
+
+        Returns:
+            Future: Resolves to the ResultSink once the scan is finished or cancelled.
+        """
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+            self.future = executor.submit(self.run)
+            executor.shutdown(wait=False)
+        else:
+            self.future = executor.submit(self.run)
+        return self.future
+
+    def cancel(self) -> None:
+        """Stop the scan as soon as possible. Results found so far stay in the sink."""
+        self.cancelled.set()
+
+    async def results(self):
+        """Run the scan in the background and yield its ScanRecords as they arrive.
+
+        Closing the generator before the end (aclose(), contextlib.aclosing...) cancels the scan.
+        """
+        loop = asyncio.get_running_loop()
+        records = asyncio.Queue()
+        self.sink.subscribe(
+            lambda record: loop.call_soon_threadsafe(records.put_nowait, record)
+        )
+        future = asyncio.wrap_future(self.start())
+        future.add_done_callback(lambda _: records.put_nowait(None))
+        try:
+            while (record := await records.get()) is not None:
+                yield record
+            await future
+        finally:
+            if not future.done():
+                self.cancel()
+
+    def __aiter__(self):
+        return self.results()
+
+    def resumable_scan(self) -> None:
+        """Run the raw scan phases in a seeded order, checkpointing the cursor as they go."""
+        checkpoint = self.checkpoint
+        state = checkpoint.state
+        if "phase" not in state:
+            # The host list is fixed before probing, so the probe order can be replayed
+            hosts = list(self.discover())
+            checkpoint.save(
+                hosts=hosts,
+                tcp_ports=encode_ports(self.tcp_ports),
+                udp_ports=encode_ports(self.udp_ports),
+                rate=self.rate,
+                output_path=self.sink.path,
+                seed=random.getrandbits(64),
+                phase=SCAN_PHASES[0][0],
+                position=0,
+                pending=[],
+                open_ports=[],
+                counts=[],
+            )
+
+        phase_names = [phase for phase, _ in SCAN_PHASES]
+        for index, (phase, scanner_class) in enumerate(SCAN_PHASES):
+            if index < phase_names.index(state["phase"]):
+                continue
+            ports = self.tcp_ports if phase == "TCP" else self.udp_ports
+            permutation = ProbePermutation(
+                state["hosts"], ports, state["seed"], state["position"]
+            )
+            # Probes in flight at the last checkpoint go out again first,
+            # the ones not reached yet stay in the next checkpoint
+            pending = deque(tuple(probe) for probe in state["pending"])
+            self.engine(scanner_class).scan(
+                chain(drain(pending), permutation),
+                checkpoint=partial(checkpoint.save_scan, phase, permutation, queued=pending),
+            )
+            if self.cancelled.is_set():
+                return None
+            if index + 1 < len(SCAN_PHASES):
+                checkpoint.save(
+                    phase=SCAN_PHASES[index + 1][0],
+                    position=0,
+                    pending=[],
+                    **checkpoint.sink_state(self.sink),
+                )
+        checkpoint.remove()
+
+    def connect_scan(self) -> None:
+        """Unprivileged users still get a TCP scan through plain connect() calls.
+
+        Raises:
+            ValueError: A checkpoint, diff, sharded or telemetry scan was asked for, connect() scans do none of them.
+        """
+        unsupported = [
+            option
+            for option, wanted in (
+                ("checkpoint", self.checkpoint),
+                ("diff_dir", self.diff_dir),
+                ("workers", self.workers != 1),
+                ("telemetry", self.telemetry),
+            )
+            if wanted
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Raw sockets unavailable and a connect() scan does not support {', '.join(unsupported)}"
+            )
+        print("[INFO]: Raw sockets unavailable, running a TCP connect() scan")
+        if self.udp_ports:
+            print("[INFO]: UDP ports skipped, a connect() scan only probes TCP")
+        run_connect_scan(
+            ProbePermutation(self.targets, self.tcp_ports),
+            sink=self.sink,
+            cancelled=self.cancelled,
+        )
+
+    def diff_scan(self) -> list:
+        """Recheck an estate against its last snapshot and report what changed.
+
+        Returns:
+            list: (phase, host, port, state) of every port newly "open" or "closed", also kept in `changes`.
+                Only the phases finished before a cancel are compared, and no snapshot is saved then.
+                Empty on the first run, which probes every port to take the baseline.
+        """
+        self.changes = []
+        store = SnapshotStore(self.diff_dir)
+        previous = store.latest()
+        # Without a snapshot a sample would leave most open ports out of the baseline,
+        # and report them as newly open over the following runs
+        baseline = previous["taken"] is None
+        rotation = previous["rotation"] + 1
+        snapshot = {"rotation": rotation, "open": {}}
+        # Maps are keyed on hosts with open ports only, a TargetSet is never expanded
+        targets = self.targets if isinstance(self.targets, TargetSet) else set(self.targets)
+        for phase, scanner_class in SCAN_PHASES:
+            ports = self.tcp_ports if phase == "TCP" else self.udp_ports
+            known_open = previous["open"].get(phase, {})
+            previous_open = {
+                host: set(open_ports) for host, open_ports in known_open.items() if host in targets
+            }
+            if baseline:
+                probes = ProbePermutation(self.targets, ports)
+            else:
+                probes = diff_probes(self.targets, ports, previous_open, rotation)
+            self.engine(scanner_class).scan(probes)
+            if self.cancelled.is_set():
+                # A partial run would report every unprobed port as newly closed
+                return self.changes
+
+            current_open = {
+                host: set(self.sink.open_bitmaps.ports(host, phase))
+                for host in self.sink.open_bitmaps.hosts(phase)
+                if host in targets
+            }
+            if baseline:
+                newly_open = newly_closed = ()
+            else:
+                newly_open, newly_closed = compare(previous_open, current_open)
+            for state, changed in (("open", newly_open), ("closed", newly_closed)):
+                for host, port in changed:
+                    self.changes.append((phase, host, port, state))
+                    for callback in self.on_change:
+                        callback(phase, host, port, state)
+
+            # Hosts outside this run keep their previous state
+            merged = {host: open_ports for host, open_ports in known_open.items() if host not in targets}
+            merged.update({host: sorted(open_ports) for host, open_ports in current_open.items() if open_ports})
+            snapshot["open"][phase] = merged
+        print(f"[INFO]: Snapshot saved to [{store.save(snapshot)}]")
+        return self.changes
+
+    def raw_scan(self) -> None:
+        scanned_hosts = []
+        live_hosts = self.discover()
+
+        # TCP ports go through the batched SYN engine, one sender and one receiver
+        engine = self.engine(SynScanner)
+        try:
+            if isinstance(self.tcp_ports, range):
+                # Lazy randomized walk of the host x port space, nothing is materialized
+                scanned_hosts = list(live_hosts)
+                engine.scan(ProbePermutation(scanned_hosts, self.tcp_ports))
+            else:
+                # Every target counts until discovery tells which ones are down
+                engine.scan(
+                    stream_probes(live_hosts, self.tcp_ports, scanned_hosts, engine.metrics),
+                    total=len(self.targets) * len(self.tcp_ports),
+                )
+        finally:
+            # A cancelled scan leaves the sweep mid-way, stop its socket and receiver now
+            live_hosts.close()
+
+        # UDP ports are classified from replies and ICMP port unreachables
+        if not self.cancelled.is_set():
+            self.engine(UdpScanner).scan(ProbePermutation(scanned_hosts, self.udp_ports))
+
+    def multiprocess_scan(self) -> None:
+        hosts = list(self.discover())
+        # One sender/receiver per worker process, results merge back into the sink
+        for phase, _ in SCAN_PHASES:
+            if self.cancelled.is_set():
+                break
+            ports = self.tcp_ports if phase == "TCP" else self.udp_ports
+            sharded_scan(
+                phase,
+                hosts,
+                ports,
+                self.rate,
+                self.sink,
+                self.workers or None,
+                self.cancelled,
+                telemetry=self.telemetry,
+            )
 
 
 def main():
-    global target_ip
-    target_ip = input("Please provide a target IP: ")
-    is_valid_ip(target_ip)
-    target_ports_input = input(
-        "Please provide a list of ports to scan -OR- Top 100 -OR- ALL: "
-    )
+    args = parse_args()
+    # Results stream to the output file as they arrive, diff mode only prints changes
+    callbacks = [] if args.diff else [report_result]
+    telemetry = []
+    if args.progress:
+        telemetry.append(report_progress)
+    if args.metrics_file:
+        telemetry.append(PrometheusTextfile(args.metrics_file))
 
-    if target_ports_input == "ALL":
-        target_ports = list(range(1, 65536))
-    elif target_ports_input == "Top 100":
-        target_ports = list(set(top_100_tcp_ports + top_100_udp_ports))
+    if args.resume:
+        scanner = Scanner.resume(args.resume, callbacks=callbacks, telemetry=telemetry)
+        print(f"[INFO]: Resuming {scanner.checkpoint.state['phase']} scan from [{args.resume}]")
     else:
-        target_ports = [
-            int(port)
-            for port in target_ports_input.split(",")
-            if port.strip().isdigit()
-        ]
+        # "!" marks exclusions, e.g. "10.0.0.0/8, !10.20.0.0/16"
+        targets = TargetSet.parse(
+            input("Please provide a target IP, CIDR or range: "),
+            read_exclude(args.exclude),
+        )
+        target_ports_input = input(
+            "Please provide a list of ports to scan -OR- Top 20/100/1000 -OR- ALL: "
+        )
+
+        target_ports, udp_ports = parse_ports(target_ports_input)
+
+        rate_input = input("Please provide a max packets per second rate [1000]: ")
+        rate = int(rate_input) if rate_input.strip().isdigit() else 1000
+        output_path = input(
+            "Please provide an output file (.jsonl or .csv) [none]: "
+        ).strip()
+        scanner = Scanner(
+            targets,
+            target_ports,
+            udp_ports,
+            rate,
+            output_path,
+            callbacks=callbacks,
+            telemetry=telemetry,
+            workers=args.workers,
+            checkpoint=ScanCheckpoint(args.checkpoint) if args.checkpoint else None,
+            diff_dir=args.diff,
+            on_change=[report_change],
+        )
 
-    ping_target(target_ip)
     try:
-        with ThreadPool() as pool:
-            pool.map(port_scan, target_ports)
+        scanner.run()
+    except ValueError as e:
+        print(f"[ERROR]: {e}")
     except KeyboardInterrupt:
         print("User exited code execution")
+        if scanner.checkpoint:
+            print(f"Continue the scan with: --resume {scanner.checkpoint.path}")
+    finally:
+        if args.bitmaps:
+            scanner.sink.open_bitmaps.save(args.bitmaps)
+
+    print_open_ports(scanner.sink)
 
+
+def print_open_ports(sink) -> None:
     print("#############################")
     print("#########OPEN PORTS##########")
     print("#############################")
-    for port, protocol in open_ports:
-        print(f"[{port}] is open ({protocol})")
+    open_ports = sorted(
+        sink.open_ports,
+        key=lambda record: (ipaddress.ip_address(record.host), record.proto, record.port),
+    )
+    for record in open_ports:
+        print(f"[{record.host}] [{record.port}] is open ({record.proto})")
     print("#############################")
 
 
@@ -1,17 +1,25 @@
 from scapy.all import *
+from pcap_reader import read_pcap, network_payload
 from datetime import datetime
+import argparse
+import struct
 
-num_telnets_in = []
-num_telnets_out = []
+ETHERTYPE_IPV4 = 0x0800
+IPPROTO_TCP = 6
+TELNET_PORT = 23
+TCP_PORTS = struct.Struct("!HH")
+
+num_telnets_in = 0
+num_telnets_out = 0
 packet_number = 0
 
 
 def telnet_monitor_callback(pcap):
-    global packet_number
+    global packet_number, num_telnets_in, num_telnets_out
     for pkt in pcap:
         packet_number += 1
-        now = datetime.now()
-        timestamp = now.strftime("%Y-%m-%d | %H:%M:%S.%f")[:-3]
+        # Capture time, which is also "now" for live captures but not for offline files
+        timestamp = datetime.fromtimestamp(float(pkt.time)).strftime("%Y-%m-%d | %H:%M:%S.%f")[:-3]
         if pkt.haslayer(TCP) and pkt[TCP].dport == 23:
             try:
                 sent_telnet = pkt.load.decode("utf-8")
@@ -23,7 +31,7 @@ def telnet_monitor_callback(pcap):
                 pass
             except AttributeError:
                 pass
-            num_telnets_out.append(pkt)
+            num_telnets_out += 1
         elif pkt.haslayer(TCP) and pkt[TCP].sport == 23:
             # Extract and decode the Telnet payload as ASCII
             try:
@@ -34,7 +42,7 @@ def telnet_monitor_callback(pcap):
                 pass
             except AttributeError:
                 pass
-            num_telnets_in.append(pkt)
+            num_telnets_in += 1
         else:
             pass
 
@@ -43,18 +51,65 @@ def display_telnet(pkt):
     return pkt.haslayer(TCP) and (pkt[TCP].dport == 23 or pkt[TCP].sport == 23)
 
 
-def telnet_capture():
+def is_telnet_frame(linktype: int, frame) -> bool:
+    """display_telnet on the raw bytes: IPv4/TCP with port 23 on either side, no dissection."""
+    ethertype, offset = network_payload(linktype, frame)
+    if ethertype != ETHERTYPE_IPV4 or len(frame) < offset + 20:
+        return False
+    if frame[offset + 9] != IPPROTO_TCP:
+        return False
+    tcp_offset = offset + (frame[offset] & 0x0F) * 4
+    if len(frame) < tcp_offset + TCP_PORTS.size:
+        return False
+    return TELNET_PORT in TCP_PORTS.unpack_from(frame, tcp_offset)
+
+
+def telnet_capture(iface="Ethernet 2"):
     try:
-        sniff(prn=telnet_monitor_callback, iface="Ethernet 2", lfilter=display_telnet)
+        sniff(prn=telnet_monitor_callback, iface=iface, lfilter=display_telnet)
 
     except KeyboardInterrupt:
         print("sniff() cancelled by user input")
 
 
+def telnet_read_pcap(path: str):
+    """Offline mode: feed the telnet packets of a pcap/pcapng file to telnet_monitor_callback.
+
+    Frames are filtered on their raw bytes first, so only telnet packets
+    ever go through a scapy dissection.
+    """
+    try:
+        for captured_at, linktype, frame in read_pcap(path):
+            if not is_telnet_frame(linktype, frame):
+                continue
+            pkt = conf.l2types.get(linktype, Raw)(bytes(frame))
+            pkt.time = captured_at
+            telnet_monitor_callback(pkt)
+    except KeyboardInterrupt:
+        print("Reading cancelled by user input")
+    except ValueError as e:
+        print(f"[ERROR]: Cannot read [{path}]: {e}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Telnet traffic monitor")
+    parser.add_argument("--iface", default="Ethernet 2", help="interface to capture on")
+    parser.add_argument(
+        "--read",
+        metavar="PCAP_FILE",
+        help="analyze a pcap/pcapng capture file instead of capturing live",
+    )
+    return parser.parse_args()
+
+
 def main():
-    telnet_capture()
-    print("Number of Telnet Packets IN:", len(num_telnets_in))
-    print("Number of Telnet Packets OUT:", len(num_telnets_out))
+    args = parse_args()
+    if args.read:
+        telnet_read_pcap(args.read)
+    else:
+        telnet_capture(args.iface)
+    print("Number of Telnet Packets IN:", num_telnets_in)
+    print("Number of Telnet Packets OUT:", num_telnets_out)
 
 
 if __name__ == "__main__":
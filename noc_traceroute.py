@@ -0,0 +1,192 @@
+from scapy.all import IP, TCP, UDP, ICMP, IPerror, TCPerror, UDPerror, ICMPerror
+from scan_engine import ProbeScanner, RttEstimator
+from scan_permutation import probe_cookie
+from packet_templates import ProbeTemplate, source_ip
+from target_sets import TargetSet
+
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACH = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+SYN_ACK = 0x12
+RST = 0x04
+# Classic traceroute UDP port base, the probe for TTL n goes to port base + n
+UDP_BASE_PORT = 33434
+TTL_MASK = 0xFF
+
+
+class TracerouteScanner(ProbeScanner):
+    """Parallel traceroute on top of the batched probe engine.
+
+    Every (destination, TTL) pair is one probe and they are all fired at once
+    from the single raw socket, instead of hop after hop. The TTL is written
+    into a field that routers quote back in their ICMP time-exceeded errors
+    (UDP destination port, TCP sequence number low byte, ICMP echo sequence
+    number), so every reply is matched to its probe from the quoted headers
+    alone. The whole trace of many destinations costs about one timeout window.
+
+    Hops are collected per destination as {ttl: (hop_ip, rtt, reached)}, see paths().
+    """
+
+    timeout_state = None
+
+    def __init__(self, mode: str = "ICMP", port: int = 80, timeout: float = 2, retries: int = 1, **kwargs):
+        """Initialize a TracerouteScanner object.
+
+        Args:
+            mode (str, optional): Probe type, "ICMP", "UDP" or "TCP" (SYN). Defaults to "ICMP".
+            port (int, optional): Destination port of TCP probes. Defaults to 80.
+            timeout (float, optional): Seconds to wait for any hop to answer. Defaults to 2.
+            retries (int, optional): Resends of unanswered probes (routers rate limit their ICMP). Defaults to 1.
+            Remaining arguments are passed to ProbeScanner.
+        """
+        if mode not in ("ICMP", "UDP", "TCP"):
+            raise ValueError(f"Unsupported traceroute mode [{mode}]")
+        self.protocol = mode
+        super().__init__(timeout=timeout, retries=retries, **kwargs)
+        self.port = port
+        self.ident = self.sport & 0xFFFF
+        # Hop RTTs grow with the TTL, so a per-host estimate would cut the far hops short
+        self.fixed_rtt = RttEstimator(initial_rto=timeout, min_rto=timeout, max_rto=timeout)
+        self.hops = {}
+
+    def host_rtt(self, dst: str) -> RttEstimator:
+        return self.fixed_rtt
+
+    def bpf_filter(self) -> str:
+        if self.protocol == "TCP":
+            return f"icmp or (tcp and dst port {self.sport})"
+        return "icmp"
+
+    def tcp_seq(self, dst: str, ttl: int) -> int:
+        return (probe_cookie(self.secret, dst, self.port) & ~TTL_MASK) | ttl
+
+    def build_probe(self, dst: str, ttl: int):
+        src = source_ip(dst)
+        if (src, ttl) not in self.templates:
+            ip = IP(src=src, dst="0.0.0.0", ttl=ttl)
+            if self.protocol == "ICMP":
+                probe = ip / ICMP(type=ICMP_ECHO_REQUEST, id=self.ident, seq=0)
+            elif self.protocol == "UDP":
+                probe = ip / UDP(sport=self.sport, dport=0)
+            else:
+                probe = ip / TCP(sport=self.sport, dport=0, flags="S")
+            self.templates[(src, ttl)] = ProbeTemplate(probe)
+        template = self.templates[(src, ttl)]
+        if self.protocol == "ICMP":
+            return template.render(dst, ttl)
+        if self.protocol == "UDP":
+            return template.render(dst, UDP_BASE_PORT + ttl)
+        return template.render(dst, self.port, self.tcp_seq(dst, ttl))
+
+    def quoted_ttl(self, pkt):
+        """TTL of our probe quoted inside an ICMP error, or None if it isn't ours."""
+        if self.protocol == "ICMP":
+            if pkt.haslayer(ICMPerror) and pkt[ICMPerror].id == self.ident:
+                return pkt[ICMPerror].seq
+        elif self.protocol == "UDP":
+            if pkt.haslayer(UDPerror) and pkt[UDPerror].sport == self.sport:
+                return pkt[UDPerror].dport - UDP_BASE_PORT
+        elif pkt.haslayer(TCPerror) and pkt[TCPerror].sport == self.sport:
+            seq = pkt[TCPerror].seq
+            if seq & ~TTL_MASK == self.tcp_seq(pkt[IPerror].dst, 0):
+                return seq & TTL_MASK
+        return None
+
+    def classify(self, pkt):
+        if not pkt.haslayer(IP):
+            return None
+        hop = pkt[IP].src
+        if pkt.haslayer(ICMP):
+            icmp_type = pkt[ICMP].type
+            if icmp_type == ICMP_ECHO_REPLY:
+                if self.protocol != "ICMP" or pkt[ICMP].id != self.ident:
+                    return None
+                return (hop, pkt[ICMP].seq), (hop, True)
+            if icmp_type not in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACH) or not pkt.haslayer(IPerror):
+                return None
+            ttl = self.quoted_ttl(pkt)
+            if ttl is None:
+                return None
+            # Port unreachable from the target ends a UDP trace, any other
+            # unreachable is the last hop that will ever answer
+            return (pkt[IPerror].dst, ttl), (hop, icmp_type == ICMP_DEST_UNREACH)
+        if self.protocol != "TCP" or not pkt.haslayer(TCP):
+            return None
+        flags = int(pkt[TCP].flags)
+        if not (flags & SYN_ACK == SYN_ACK or flags & RST):
+            return None
+        ack = (pkt[TCP].ack - 1) & 0xFFFFFFFF
+        if ack & ~TTL_MASK != self.tcp_seq(hop, 0):
+            return None
+        return (hop, ack & TTL_MASK), (hop, True)
+
+    def _record(self, probe: tuple, state, rtt: float = None) -> None:
+        with self.lock:
+            self.metrics.results += 1
+        dst, ttl = probe
+        hop, reached = state if state is not None else (None, False)
+        self.hops.setdefault(dst, {})[ttl] = (hop, rtt, reached)
+        if self.on_result:
+            self.on_result(dst, ttl, state)
+
+    def trace(self, destinations, max_hops: int = 30) -> dict:
+        """Trace the path to every destination at once.
+
+        Args:
+            destinations (iterable): Destination IPs.
+            max_hops (int, optional): Highest TTL probed. Defaults to 30.
+
+        Returns:
+            dict: {destination: [(ttl, hop_ip or None, rtt), ...]}, see paths().
+        """
+        destinations = list(destinations)
+        # TTL-major order: every destination gets its first hops before anyone's last
+        self.scan(
+            (dst, ttl) for ttl in range(1, max_hops + 1) for dst in destinations
+        )
+        return self.paths(destinations)
+
+    def paths(self, destinations) -> dict:
+        """Per-destination hop lists, cut at the first TTL that reached the end of the path."""
+        paths = {}
+        for dst in destinations:
+            hops = self.hops.get(dst, {})
+            path = []
+            for ttl in sorted(hops):
+                hop, rtt, reached = hops[ttl]
+                path.append((ttl, hop, rtt))
+                if reached:
+                    break
+            paths[dst] = path
+        return paths
+
+
+def print_paths(paths: dict) -> None:
+    for dst, path in paths.items():
+        print(f"[TRACEROUTE] [{dst}]")
+        for ttl, hop, rtt in path:
+            if hop is None:
+                print(f"{ttl:>3}  *")
+            else:
+                print(f"{ttl:>3}  {hop:<15}  {rtt * 1000:.1f} ms")
+
+
+def main():
+    destinations = list(
+        TargetSet.parse(input("Please provide a destination IP, CIDR or range: "))
+    )
+    mode = input("Please provide a probe type ICMP/UDP/TCP [ICMP]: ").strip().upper() or "ICMP"
+    max_hops_input = input("Please provide the max number of hops [30]: ")
+    max_hops = int(max_hops_input) if max_hops_input.strip().isdigit() else 30
+    try:
+        tracer = TracerouteScanner(mode)
+        print_paths(tracer.trace(destinations, max_hops))
+    except ValueError as e:
+        print(f"[ERROR]: {e}")
+    except KeyboardInterrupt:
+        print("User exited code execution")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from scapy.all import IP, conf
+from functools import lru_cache
+import socket
+import struct
+import sys
+
+IPPROTO_ICMP = 1
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+WORDS2 = struct.Struct("!HH")
+WORD = struct.Struct("!H")
+LONG = struct.Struct("!I")
+
+
+def checksum_adjust(checksum: int, old_words, new_words) -> int:
+    """Incrementally update a ones' complement checksum (RFC 1624: HC' = ~(~HC + ~m + m'))."""
+    total = ~checksum & 0xFFFF
+    for word in old_words:
+        total += ~word & 0xFFFF
+    for word in new_words:
+        total += word
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+@lru_cache(maxsize=4096)
+def source_ip(dst: str) -> str:
+    """Local address the kernel routes dst through (cached, scapy routing is slow)."""
+    return conf.route.route(dst)[1]
+
+
+@lru_cache(maxsize=4096)
+def egress_interface(dst: str) -> str:
+    """Interface the kernel routes dst out of (cached like source_ip)."""
+    return conf.route.route(dst)[0]
+
+
+class ProbeTemplate:
+    """Pre-serialized IPv4 TCP/UDP/ICMP echo probe patched in place for every target.
+
+    The probe is built and checksummed by scapy once. Rendering a probe only
+    rewrites the destination address, destination port and (TCP) sequence
+    number inside one preallocated bytearray and adjusts both checksums
+    incrementally, so the hot loop allocates no scapy objects at all.
+    ICMP echo requests have no ports, their sequence number takes the place
+    of the destination port.
+    """
+
+    def __init__(self, packet):
+        """Initialize a ProbeTemplate object.
+
+        Args:
+            packet (scapy.Packet): IP/TCP, IP/UDP or IP/ICMP echo probe to use as the template.
+        """
+        self.buffer = bytearray(bytes(packet))
+        self.view = memoryview(self.buffer)
+        ihl = (self.buffer[0] & 0x0F) * 4
+        self.protocol = self.buffer[9]
+        self.dport_offset = ihl + 2
+        # TCP and UDP checksums cover the addresses through the pseudo header, ICMP's doesn't
+        self.pseudo_header = self.protocol != IPPROTO_ICMP
+        if self.protocol == IPPROTO_TCP:
+            self.seq_offset = ihl + 4
+            self.l4_checksum_offset = ihl + 16
+        elif self.protocol == IPPROTO_UDP:
+            self.seq_offset = None
+            self.l4_checksum_offset = ihl + 6
+        elif self.protocol == IPPROTO_ICMP:
+            self.seq_offset = None
+            self.dport_offset = ihl + 6
+            self.l4_checksum_offset = ihl + 2
+        else:
+            raise ValueError(f"Unsupported template protocol [{self.protocol}]")
+        self.base_ip_checksum = WORD.unpack_from(self.buffer, 10)[0]
+        self.base_l4_checksum = WORD.unpack_from(self.buffer, self.l4_checksum_offset)[0]
+        self.base_dst = WORDS2.unpack_from(self.buffer, 16)
+        self.base_dport = WORD.unpack_from(self.buffer, self.dport_offset)
+        self.base_seq = (
+            WORDS2.unpack_from(self.buffer, self.seq_offset) if self.seq_offset else ()
+        )
+
+    def render(self, dst: str, dport: int, seq: int = 0) -> memoryview:
+        """Patch the template for one probe.
+
+        The returned view aliases the template buffer and is only valid until
+        the next call to render.
+
+        Args:
+            dst (str): Target IPv4 address.
+            dport (int): Target port (ICMP echo sequence number).
+            seq (int, optional): TCP sequence number, ignored for UDP. Defaults to 0.
+
+        Returns:
+            memoryview: The ready to send IP datagram.
+        """
+        dst_bytes = socket.inet_aton(dst)
+        dst_words = WORDS2.unpack(dst_bytes)
+        self.buffer[16:20] = dst_bytes
+        WORD.pack_into(self.buffer, self.dport_offset, dport)
+        WORD.pack_into(
+            self.buffer,
+            10,
+            checksum_adjust(self.base_ip_checksum, self.base_dst, dst_words),
+        )
+        old_words = self.base_dport
+        new_words = (dport,)
+        if self.pseudo_header:
+            old_words = self.base_dst + old_words
+            new_words = dst_words + new_words
+        if self.seq_offset is not None:
+            LONG.pack_into(self.buffer, self.seq_offset, seq)
+            old_words += self.base_seq
+            new_words += WORDS2.unpack_from(self.buffer, self.seq_offset)
+        l4_checksum = checksum_adjust(self.base_l4_checksum, old_words, new_words)
+        if self.protocol == IPPROTO_UDP and l4_checksum == 0:
+            l4_checksum = 0xFFFF
+        WORD.pack_into(self.buffer, self.l4_checksum_offset, l4_checksum)
+        return self.view
+
+
+class RawSender:
+    """Send fully built IPv4 datagrams through one IP_HDRINCL raw socket."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_RAW)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_HDRINCL, 1)
+
+    def send(self, datagram, dst: str) -> None:
+        self.sock.sendto(datagram, (dst, 0))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class ScapySender:
+    """Fallback for platforms (Windows) whose raw sockets refuse TCP/UDP datagrams."""
+
+    def __init__(self):
+        self.sock = conf.L3socket()
+
+    def send(self, datagram, dst: str) -> None:
+        self.sock.send(IP(bytes(datagram)))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def open_sender():
+    if sys.platform.startswith("win"):
+        return ScapySender()
+    return RawSender()
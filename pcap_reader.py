@@ -0,0 +1,176 @@
+import mmap
+import os
+import struct
+
+PCAP_MAGIC_MICRO = 0xA1B2C3D4
+PCAP_MAGIC_NANO = 0xA1B23C4D
+PCAPNG_SECTION_HEADER = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_INTERFACE_DESCRIPTION = 0x00000001
+PCAPNG_SIMPLE_PACKET = 0x00000003
+PCAPNG_ENHANCED_PACKET = 0x00000006
+PCAPNG_OPTION_END = 0
+PCAPNG_IF_TSRESOL = 9
+
+LINKTYPE_ETHERNET = 1
+LINKTYPE_LINUX_SLL = 113
+ETHERTYPE_VLAN = (0x8100, 0x88A8)
+
+# Per byte order: pcap global header, pcap record header, pcapng block header,
+# interface description body, enhanced packet body, option header
+PCAP_FORMATS = {
+    order: (
+        struct.Struct(order + "IHHiIII"),
+        struct.Struct(order + "IIII"),
+        struct.Struct(order + "II"),
+        struct.Struct(order + "HHI"),
+        struct.Struct(order + "IIIII"),
+        struct.Struct(order + "HH"),
+    )
+    for order in ("<", ">")
+}
+ETHERTYPE = struct.Struct("!H")
+
+
+def read_pcap(path: str):
+    """Walk the packets of a pcap or pcapng file without reading it into memory.
+
+    The file is memory-mapped and every packet is handed out as a memoryview
+    slice of the mapping: record headers are decoded in place and no packet
+    bytes are copied, so multi-GB captures stream at the speed the page cache
+    can serve them. A yielded view is only valid until the next packet, copy
+    it (bytes(frame)) to keep it.
+
+    Args:
+        path (str): Capture file, classic pcap (us/ns, either byte order) or pcapng.
+
+    Raises:
+        ValueError: The file is empty or not a pcap/pcapng capture.
+
+    Yields:
+        tuple: (timestamp, linktype, frame) with frame a memoryview of the captured bytes.
+    """
+    with open(path, "rb") as capture_file:
+        if os.fstat(capture_file.fileno()).st_size < 4:
+            raise ValueError("Empty or truncated capture file")
+        with mmap.mmap(capture_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                magic = bytes(view[:4])
+                if struct.unpack("<I", magic)[0] == PCAPNG_SECTION_HEADER:
+                    yield from _read_pcapng(view)
+                else:
+                    yield from _read_classic(view)
+            finally:
+                view.release()
+
+
+def _read_classic(view):
+    for order in ("<", ">"):
+        magic = struct.unpack_from(order + "I", view)[0]
+        if magic in (PCAP_MAGIC_MICRO, PCAP_MAGIC_NANO):
+            break
+    else:
+        raise ValueError("Not a pcap or pcapng file")
+    global_header, record_header = PCAP_FORMATS[order][:2]
+    if len(view) < global_header.size:
+        raise ValueError("Truncated pcap global header")
+    linktype = global_header.unpack_from(view)[6] & 0x0FFFFFFF
+    resolution = 1e-9 if magic == PCAP_MAGIC_NANO else 1e-6
+    offset = global_header.size
+    end = len(view)
+    while offset + record_header.size <= end:
+        seconds, fraction, captured, _ = record_header.unpack_from(view, offset)
+        offset += record_header.size
+        if offset + captured > end:
+            break  # Truncated last record
+        frame = view[offset:offset + captured]
+        # Released even when the consumer stops early, or the mmap could not be closed
+        try:
+            yield seconds + fraction * resolution, linktype, frame
+        finally:
+            frame.release()
+        offset += captured
+
+
+def _read_pcapng(view):
+    order = "<"
+    interfaces = []
+    offset = 0
+    end = len(view)
+    while offset + 12 <= end:
+        block_header = PCAP_FORMATS[order][2]
+        block_type, block_length = block_header.unpack_from(view, offset)
+        if block_type == PCAPNG_SECTION_HEADER:
+            # Every section declares its own byte order
+            byte_order_magic = struct.unpack_from("<I", view, offset + 8)[0]
+            order = "<" if byte_order_magic == PCAPNG_BYTE_ORDER_MAGIC else ">"
+            block_header = PCAP_FORMATS[order][2]
+            block_type, block_length = block_header.unpack_from(view, offset)
+            interfaces = []
+        if block_length < 12 or offset + block_length > end:
+            break  # Truncated or corrupt block
+        body = offset + 8
+        body_end = offset + block_length - 4
+        if block_type == PCAPNG_INTERFACE_DESCRIPTION:
+            interface_header = PCAP_FORMATS[order][3]
+            linktype, _, _ = interface_header.unpack_from(view, body)
+            resolution = _interface_resolution(
+                view, body + interface_header.size, body_end, PCAP_FORMATS[order][5]
+            )
+            interfaces.append((linktype, resolution))
+        elif block_type == PCAPNG_ENHANCED_PACKET and interfaces:
+            packet_header = PCAP_FORMATS[order][4]
+            interface, high, low, captured, _ = packet_header.unpack_from(view, body)
+            linktype, resolution = interfaces[interface]
+            start = body + packet_header.size
+            frame = view[start:min(start + captured, body_end)]
+            try:
+                yield ((high << 32) | low) * resolution, linktype, frame
+            finally:
+                frame.release()
+        elif block_type == PCAPNG_SIMPLE_PACKET and interfaces:
+            original = struct.unpack_from(order + "I", view, body)[0]
+            start = body + 4
+            frame = view[start:min(start + original, body_end)]
+            # Simple packets carry no timestamp
+            try:
+                yield 0.0, interfaces[0][0], frame
+            finally:
+                frame.release()
+        offset += block_length
+
+
+def _interface_resolution(view, offset: int, end: int, option_header) -> float:
+    """Seconds per timestamp unit of an interface (if_tsresol option, microseconds by default)."""
+    while offset + option_header.size <= end:
+        code, length = option_header.unpack_from(view, offset)
+        if code == PCAPNG_OPTION_END:
+            break
+        if code == PCAPNG_IF_TSRESOL and length >= 1:
+            value = view[offset + option_header.size]
+            if value & 0x80:
+                return 2.0 ** -(value & 0x7F)
+            return 10.0 ** -value
+        # Option values are padded to 32 bits
+        offset += option_header.size + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def network_payload(linktype: int, frame) -> tuple:
+    """(ethertype, offset of the network header) of a captured frame, or (None, 0) for other links.
+
+    Ethernet (with 802.1Q/802.1ad tags skipped) and Linux cooked captures are understood.
+    """
+    if linktype == LINKTYPE_ETHERNET:
+        offset = 12
+        if len(frame) < offset + 2:
+            return None, 0
+        ethertype = ETHERTYPE.unpack_from(frame, offset)[0]
+        while ethertype in ETHERTYPE_VLAN and len(frame) >= offset + 6:
+            offset += 4
+            ethertype = ETHERTYPE.unpack_from(frame, offset)[0]
+        return ethertype, offset + 2
+    if linktype == LINKTYPE_LINUX_SLL and len(frame) >= 16:
+        return ETHERTYPE.unpack_from(frame, 14)[0], 16
+    return None, 0
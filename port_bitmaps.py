@@ -0,0 +1,129 @@
+from collections import Counter
+import ipaddress
+import re
+import struct
+import zlib
+
+BITMAP_BYTES = 65536 // 8
+FILE_MAGIC = b"NOCBMP1\n"
+RECORD_HEADER = struct.Struct("!B16sBI")
+PROTO_CODES = {"TCP": 6, "UDP": 17}
+PROTO_NAMES = {code: name for name, code in PROTO_CODES.items()}
+NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+
+class PortBitmaps:
+    """Open ports of a whole fleet as one 65536-bit bitmap per (host, protocol).
+
+    Bit n of a bitmap (byte n >> 3, bit n & 7) is port n, so a bitmap read
+    with int.from_bytes(..., "little") is an integer whose set bits are the
+    open ports. Membership is a single byte test and set operations across
+    hosts are whole-bitmap integer ANDs/ORs.
+    """
+
+    def __init__(self):
+        self.bitmaps = {}
+
+    def __len__(self) -> int:
+        return len(self.bitmaps)
+
+    def bitmap(self, host: str, proto: str) -> bytearray:
+        key = (host, proto)
+        if key not in self.bitmaps:
+            self.bitmaps[key] = bytearray(BITMAP_BYTES)
+        return self.bitmaps[key]
+
+    def add(self, host: str, port: int, proto: str) -> None:
+        self.bitmap(host, proto)[port >> 3] |= 1 << (port & 7)
+
+    def discard(self, host: str, port: int, proto: str) -> None:
+        bitmap = self.bitmaps.get((host, proto))
+        if bitmap is not None:
+            bitmap[port >> 3] &= ~(1 << (port & 7)) & 0xFF
+
+    def has(self, host: str, port: int, proto: str) -> bool:
+        bitmap = self.bitmaps.get((host, proto))
+        return bitmap is not None and bool(bitmap[port >> 3] & (1 << (port & 7)))
+
+    def ports(self, host: str, proto: str):
+        """Yield the open ports of one host, ascending. Empty bytes are skipped at C speed."""
+        bitmap = self.bitmaps.get((host, proto))
+        if bitmap is None:
+            return
+        for match in NONZERO_BYTE.finditer(bitmap):
+            index = match.start()
+            byte = bitmap[index]
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield (index << 3) | bit
+
+    def items(self, proto: str = None):
+        """Yield (host, port, proto) for every open port."""
+        for host, bitmap_proto in list(self.bitmaps):
+            if proto is None or bitmap_proto == proto:
+                for port in self.ports(host, bitmap_proto):
+                    yield host, port, bitmap_proto
+
+    def hosts(self, proto: str = None) -> list:
+        return [host for host, bitmap_proto in self.bitmaps if proto in (None, bitmap_proto)]
+
+    def as_int(self, host: str, proto: str) -> int:
+        return int.from_bytes(self.bitmaps.get((host, proto), b""), "little")
+
+    def hosts_matching(self, proto: str, all_of=(), none_of=()) -> list:
+        """Hosts with every port of all_of open and none of none_of.
+
+        Example: hosts_matching("TCP", all_of=[22], none_of=[23]) is
+        "hosts with SSH open but not telnet".
+        """
+        want = sum(1 << port for port in set(all_of))
+        forbid = sum(1 << port for port in set(none_of))
+        matching = []
+        for (host, bitmap_proto), bitmap in self.bitmaps.items():
+            if bitmap_proto != proto:
+                continue
+            value = int.from_bytes(bitmap, "little")
+            if value & want == want and not value & forbid:
+                matching.append(host)
+        return matching
+
+    def popularity(self, proto: str) -> Counter:
+        """How many hosts have each port open, across the fleet."""
+        counts = Counter()
+        for host in self.hosts(proto):
+            counts.update(self.ports(host, proto))
+        return counts
+
+    def union(self, proto: str) -> int:
+        """Ports open on at least one host, as an int bitmap."""
+        value = 0
+        for (host, bitmap_proto), bitmap in self.bitmaps.items():
+            if bitmap_proto == proto:
+                value |= int.from_bytes(bitmap, "little")
+        return value
+
+    def save(self, path: str) -> None:
+        """Write every bitmap to disk, zlib compressed (mostly-zero bitmaps shrink to a few bytes)."""
+        with open(path, "wb") as bitmap_file:
+            bitmap_file.write(FILE_MAGIC)
+            for (host, proto), bitmap in self.bitmaps.items():
+                packed = ipaddress.ip_address(host).packed
+                data = zlib.compress(bytes(bitmap), 1)
+                bitmap_file.write(
+                    RECORD_HEADER.pack(len(packed), packed, PROTO_CODES[proto], len(data))
+                )
+                bitmap_file.write(data)
+
+    @classmethod
+    def load(cls, path: str) -> "PortBitmaps":
+        bitmaps = cls()
+        with open(path, "rb") as bitmap_file:
+            if bitmap_file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"[{path}] is not a port bitmap file")
+            while header := bitmap_file.read(RECORD_HEADER.size):
+                address_length, packed, proto_code, data_length = RECORD_HEADER.unpack(header)
+                host = str(ipaddress.ip_address(packed[:address_length]))
+                bitmaps.bitmaps[(host, PROTO_NAMES[proto_code])] = bytearray(
+                    zlib.decompress(bitmap_file.read(data_length))
+                )
+        return bitmaps
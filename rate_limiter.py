@@ -0,0 +1,121 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket pacing packet output to `rate` packets per second."""
+
+    def __init__(self, rate: float, burst: float = None):
+        """Initialize a TokenBucket object.
+
+        Args:
+            rate (float): Tokens (packets) added per second.
+            burst (float, optional): Bucket size. Defaults to 1/20th of a second worth of tokens.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate / 20, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Take `tokens` tokens if they are available, without blocking.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds until they will be available.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until `tokens` tokens are available, then take them."""
+        while (wait := self.try_acquire(tokens)) > 0:
+            time.sleep(wait)
+
+
+class AimdRateLimiter(TokenBucket):
+    """Token bucket whose rate follows additive-increase/multiplicative-decrease.
+
+    The rate never goes above `max_rate`, so a scan can be capped to a known
+    pps next to production traffic. Once per `window` seconds the reply ratio
+    of that window is compared to the best ratio seen so far; a sharp drop, or
+    any ICMP rate-limit response, halves the rate (down to `min_rate`).
+    Otherwise the rate grows back by `increase` pps.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 10,
+        increase: float = None,
+        decrease: float = 0.5,
+        window: float = 1,
+        drop_threshold: float = 0.5,
+    ):
+        """Initialize an AimdRateLimiter object.
+
+        Args:
+            max_rate (float): Hard ceiling in packets per second, also the starting rate.
+            min_rate (float, optional): Floor the rate never drops under. Defaults to 10.
+            increase (float, optional): pps added after a healthy window. Defaults to 5% of max_rate.
+            decrease (float, optional): Factor applied to the rate on congestion. Defaults to 0.5.
+            window (float, optional): Seconds between rate adjustments. Defaults to 1.
+            drop_threshold (float, optional): Fraction of the best reply ratio under which the
+                window counts as congested. Defaults to 0.5.
+        """
+        super().__init__(max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.increase = increase if increase is not None else max(max_rate / 20, 1)
+        self.decrease = decrease
+        self.window = window
+        self.drop_threshold = drop_threshold
+        self.best_ratio = 0
+        self.window_start = time.monotonic()
+        self.sent = 0
+        self.replies = 0
+        self.rate_limited = False
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        wait = super().try_acquire(tokens)
+        if not wait:
+            with self.lock:
+                self.sent += tokens
+            self.adjust()
+        return wait
+
+    def on_reply(self) -> None:
+        with self.lock:
+            self.replies += 1
+
+    def on_rate_limited(self) -> None:
+        """Record an ICMP rate-limit/prohibited response seen during this window."""
+        with self.lock:
+            self.rate_limited = True
+
+    def adjust(self) -> None:
+        """Apply AIMD once the current window has elapsed."""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start < self.window or not self.sent:
+                return None
+            ratio = self.replies / self.sent
+            if self.rate_limited or ratio < self.best_ratio * self.drop_threshold:
+                self.rate = max(self.rate * self.decrease, self.min_rate)
+            else:
+                self.rate = min(self.rate + self.increase, self.max_rate)
+            # Decay the reference so a permanently quieter target set is not punished forever
+            self.best_ratio = max(self.best_ratio * 0.95, ratio)
+            self.burst = max(self.rate / 20, 1)
+            self.window_start = now
+            self.sent = 0
+            self.replies = 0
+            self.rate_limited = False
@@ -0,0 +1,95 @@
+import json
+import os
+
+CHECKPOINT_VERSION = 1
+
+
+def encode_ports(ports):
+    """Ranges are stored as their bounds, so "ALL" costs two integers on disk."""
+    if isinstance(ports, range):
+        return {"range": [ports.start, ports.stop]}
+    return list(ports)
+
+
+def decode_ports(ports):
+    if isinstance(ports, dict):
+        return range(*ports["range"])
+    return ports
+
+
+def drain(queue):
+    """Yield and remove the probes of a deque, so what is left of it can still be checkpointed."""
+    while queue:
+        yield queue.popleft()
+
+
+class ScanCheckpoint:
+    """Compact on-disk scan state used to resume an interrupted scan.
+
+    The probe order is a seeded ProbePermutation, so the cursor is just
+    (phase, seed, position) plus the handful of probes that were still in
+    flight. Completed results live in the streamed output file; only the open
+    ports and counters are copied here to rebuild the final summary.
+
+    [EXAMPLE STATE]:
+        {"version": 1, "hosts": ["10.0.0.1", "10.0.0.7"], "tcp_ports": {"range": [1, 65536]},
+         "udp_ports": {"range": [1, 65536]}, "rate": 1000, "output_path": "scan.jsonl",
+         "seed": 1234, "phase": "TCP", "position": 40312, "pending": [["10.0.0.7", 443]],
+         "open_ports": [["10.0.0.1", 22, "TCP", "open", null]], "counts": [["TCP", "closed", 40291]]}
+    """
+
+    def __init__(self, path: str, state: dict = None):
+        """Initialize a ScanCheckpoint object.
+
+        Args:
+            path (str): State file location.
+            state (dict, optional): Already loaded state. A fresh one is started if not provided.
+        """
+        self.path = path
+        self.state = state if state is not None else {"version": CHECKPOINT_VERSION}
+
+    @classmethod
+    def load(cls, path: str) -> "ScanCheckpoint":
+        with open(path) as state_file:
+            state = json.load(state_file)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in [{path}]")
+        return cls(path, state)
+
+    def save(self, **updates) -> None:
+        """Merge updates into the state and write it atomically."""
+        self.state.update(updates)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as state_file:
+            json.dump(self.state, state_file, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def sink_state(sink) -> dict:
+        """Open ports and counters of a ResultSink, in checkpoint form."""
+        open_ports = [list(record) for record in sink.open_ports]
+        with sink.lock:
+            counts = [[proto, state, count] for (proto, state), count in sink.counts.items()]
+        return {"open_ports": open_ports, "counts": counts}
+
+    def save_scan(self, phase: str, permutation, scanner, queued=()) -> None:
+        """Checkpoint a running ProbeScanner walking `permutation`.
+
+        Meant to be handed to ProbeScanner.scan as its checkpoint callback.
+
+        Args:
+            queued (deque, optional): Pending probes of the previous checkpoint not resent yet (see drain).
+        """
+        pending = scanner.pending_probes()
+        pending += [probe for probe in queued if probe not in pending]
+        self.save(
+            phase=phase,
+            seed=permutation.seed,
+            position=permutation.position,
+            pending=[list(probe) for probe in pending],
+            **self.sink_state(scanner.sink),
+        )
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,90 @@
+from scan_permutation import ProbePermutation
+from datetime import datetime
+import json
+import os
+
+DEFAULT_SLICES = 10
+
+
+class SnapshotStore:
+    """Directory of scan snapshots, one compact JSON file per run.
+
+    [EXAMPLE SNAPSHOT]:
+        {"taken": "2024-03-01T02:00:00", "rotation": 12,
+         "open": {"TCP": {"10.0.0.1": [22, 443]}, "UDP": {"10.0.0.1": [161]}}}
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def snapshots(self) -> list:
+        """Snapshot file paths, oldest first (file names sort chronologically)."""
+        return [
+            os.path.join(self.directory, name)
+            for name in sorted(os.listdir(self.directory))
+            if name.endswith(".json")
+        ]
+
+    def latest(self) -> dict:
+        """The most recent snapshot, or an empty one before the first run."""
+        paths = self.snapshots()
+        if not paths:
+            return {"taken": None, "rotation": -1, "open": {}}
+        with open(paths[-1]) as snapshot_file:
+            return json.load(snapshot_file)
+
+    def save(self, snapshot: dict) -> str:
+        snapshot["taken"] = datetime.now().isoformat(timespec="seconds")
+        path = os.path.join(
+            self.directory, datetime.now().strftime("%Y%m%d-%H%M%S-%f") + ".json"
+        )
+        with open(path, "w") as snapshot_file:
+            json.dump(snapshot, snapshot_file, separators=(",", ":"))
+        return path
+
+
+def sample_ports(ports, rotation: int, slices: int = DEFAULT_SLICES) -> list:
+    """The 1/slices share of ports due for a recheck this run.
+
+    Consecutive rotations cover disjoint slices, so every port is rechecked
+    once every `slices` runs.
+    """
+    return [port for index, port in enumerate(ports) if index % slices == rotation % slices]
+
+
+def diff_probes(hosts, ports, previous_open: dict, rotation: int, slices: int = DEFAULT_SLICES):
+    """Probes for a diff scan: previously open ports first, then a rotating sample.
+
+    Args:
+        hosts (list): Target IPs, or a TargetSet.
+        ports (sequence): Full port set the estate is watched on.
+        previous_open (dict): {host: set(ports)} open in the previous snapshot, for target hosts only.
+        rotation (int): Run counter selecting this run's sample slice.
+        slices (int, optional): Number of runs it takes to recheck every port. Defaults to 10.
+
+    Yields:
+        tuple: (host, port)
+    """
+    for host, open_ports in previous_open.items():
+        for port in sorted(open_ports):
+            yield host, port
+    for host, port in ProbePermutation(hosts, sample_ports(ports, rotation, slices)):
+        if port not in previous_open.get(host, ()):
+            yield host, port
+
+
+def compare(previous_open: dict, current_open: dict) -> tuple:
+    """Changes between two {host: set(ports)} maps of open ports.
+
+    Returns:
+        tuple: (newly_open, newly_closed), each a sorted list of (host, port).
+    """
+    newly_open = []
+    newly_closed = []
+    for host in previous_open.keys() | current_open.keys():
+        before = previous_open.get(host, set())
+        after = current_open.get(host, set())
+        newly_open.extend((host, port) for port in after - before)
+        newly_closed.extend((host, port) for port in before - after)
+    return sorted(newly_open), sorted(newly_closed)
@@ -0,0 +1,493 @@
+from scapy.all import (
+    IP,
+    TCP,
+    UDP,
+    ICMP,
+    IPerror,
+    TCPerror,
+    UDPerror,
+    AsyncSniffer,
+    Raw,
+)
+from packet_templates import ProbeTemplate, egress_interface, open_sender, source_ip
+from scan_permutation import probe_cookie
+from rate_limiter import AimdRateLimiter
+from udp_payloads import udp_payload
+from scan_results import ResultSink
+from scan_metrics import ScanMetrics, probe_count
+from collections import deque
+import heapq
+import os
+import random
+import threading
+import time
+
+SYN_ACK = 0x12
+RST = 0x04
+ICMP_DEST_UNREACH = 3
+ICMP_SOURCE_QUENCH = 4
+ICMP_PORT_UNREACH = 3
+# Network/host administratively prohibited, communication administratively filtered
+ICMP_PROHIBITED_CODES = (9, 10, 13)
+# Probes held back by host_delay() before the sender stops taking new ones
+MAX_DEFERRED = 1024
+
+
+class RttEstimator:
+    """Smoothed round trip time estimator, as used for TCP's RTO (RFC 6298)."""
+
+    def __init__(self, initial_rto: float = 1, min_rto: float = 0.05, max_rto: float = 10):
+        self.srtt = None
+        self.rttvar = None
+        self.rto = initial_rto
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+
+    def update(self, sample: float) -> None:
+        """Fold one RTT sample (in seconds) into SRTT/RTTVAR and recompute the RTO."""
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - sample)
+            self.srtt = 0.875 * self.srtt + 0.125 * sample
+        self.rto = min(max(self.srtt + 4 * self.rttvar, self.min_rto), self.max_rto)
+
+
+class ProbeScanner:
+    """Single-sender / single-receiver probe engine shared by the scan types.
+
+    All probes are fired from a single raw socket while a single AsyncSniffer
+    collects the replies, so no probe ever waits on its own round trip.
+    Subclasses describe their probes through `bpf_filter`, `build_probe` and
+    `classify`; probes are rendered from pre-serialized ProbeTemplates rather
+    than built layer by layer.
+
+    Timeouts follow a per-host RTT estimate instead of a fixed wait, and only
+    the probes that went unanswered are retransmitted, up to `retries` times.
+    The in-flight window only ever holds probes younger than their host's RTO.
+
+    Output is paced by an AIMD token bucket capped at `rate` packets per second.
+
+    Progress (probes sent, replies, retransmits, pps, ETA...) is tracked in
+    `metrics`, see ScanMetrics.
+    """
+
+    protocol = None
+    timeout_state = "filtered"
+
+    def __init__(
+        self,
+        timeout: float = 1,
+        retries: int = 2,
+        rate: float = 1000,
+        on_result=None,
+        sink: ResultSink = None,
+        metrics: ScanMetrics = None,
+        cancelled: threading.Event = None,
+    ):
+        """Initialize a ProbeScanner object.
+
+        Args:
+            timeout (float, optional): Initial per-host timeout until RTT samples arrive. Defaults to 1.
+            retries (int, optional): How many times an unanswered probe is resent. Defaults to 2.
+            rate (float, optional): Maximum packets per second. Defaults to 1000.
+            on_result (callable, optional): Called as on_result(dst, port, state) for every probe.
+                Probes still unanswered once retries are exhausted get `timeout_state`.
+            sink (ResultSink, optional): Where results are recorded. An in-memory one is created if not provided.
+            metrics (ScanMetrics, optional): Telemetry to update. A silent one is created if not provided.
+            cancelled (threading.Event, optional): Stops the scan once set, may be shared between scanners.
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.on_result = on_result
+        self.sport = random.randint(32768, 60999)
+        self.secret = os.urandom(16)
+        self.limiter = AimdRateLimiter(max_rate=rate)
+        self.templates = {}
+        self.rtt = {}
+        self.inflight = {}
+        # Min-heap of (deadline, sent_at, probe), RTOs differ per host so send order is not deadline order
+        self.deadlines = []
+        # Probes held back by host_delay(), a FIFO per host and a min-heap of (ready_at, dst) over those hosts
+        self.host_queues = {}
+        self.ready_hosts = []
+        self.deferred = 0
+        self.max_deferred = MAX_DEFERRED
+        self.sink = sink if sink is not None else ResultSink()
+        self.metrics = metrics if metrics is not None else ScanMetrics()
+        if self.metrics.proto is None:
+            self.metrics.proto = self.protocol
+        self.unsent = None
+        # One sniffer per interface probes were routed out of, started on its first probe
+        self.sniffers = {}
+        self.cancelled = cancelled if cancelled is not None else threading.Event()
+        self.lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Stop sending and return from scan() without waiting on the probes in flight."""
+        self.cancelled.set()
+
+    def bpf_filter(self) -> str:
+        raise NotImplementedError
+
+    def build_probe(self, dst: str, port: int):
+        """Render the datagram probing dst:port (see ProbeTemplate.render)."""
+        raise NotImplementedError
+
+    def classify(self, pkt):
+        """Map a sniffed packet to ((dst, port), state), or None if it is not a reply."""
+        raise NotImplementedError
+
+    def on_timeout(self, probe: tuple) -> None:
+        """Hook called every time an in-flight probe expires unanswered."""
+        return None
+
+    def host_delay(self, dst: str) -> float:
+        """Seconds before `dst` may be probed again, 0 to probe it now. Per-host pacing hook."""
+        return 0
+
+    def host_rtt(self, dst: str) -> RttEstimator:
+        if dst not in self.rtt:
+            self.rtt[dst] = RttEstimator(initial_rto=self.timeout)
+        return self.rtt[dst]
+
+    def icmp_error_state(self, pkt):
+        """State implied by an ICMP error quoting one of our probes.
+
+        Prohibited and source-quench errors also throttle the rate limiter.
+        """
+        icmp_type, icmp_code = pkt[ICMP].type, pkt[ICMP].code
+        if icmp_type == ICMP_SOURCE_QUENCH or (
+            icmp_type == ICMP_DEST_UNREACH and icmp_code in ICMP_PROHIBITED_CODES
+        ):
+            self.limiter.on_rate_limited()
+        if icmp_type == ICMP_DEST_UNREACH:
+            return "filtered"
+        return None
+
+    def _record(self, probe: tuple, state: str, rtt: float = None) -> None:
+        with self.lock:
+            self.metrics.results += 1
+        self.sink.add(probe[0], probe[1], self.protocol, state, rtt)
+        if self.on_result:
+            self.on_result(probe[0], probe[1], state)
+
+    def _receive(self, pkt) -> None:
+        classified = self.classify(pkt)
+        if classified is None:
+            return None
+        probe, state = classified
+        with self.lock:
+            sent = self.inflight.pop(probe, None)
+            if sent is None:
+                return None
+            sent_at, attempts = sent
+            rtt = max(float(pkt.time) - sent_at, 0)
+            # Karn's algorithm: a reply to a resent probe is an ambiguous sample
+            if attempts == 1:
+                self.host_rtt(probe[0]).update(rtt)
+            self.metrics.replies += 1
+        self.limiter.on_reply()
+        self._record(probe, state, rtt)
+
+    def _send(self, sender, probe: tuple, attempts: int) -> None:
+        # A reply to the previous attempt may have landed since the retransmission was decided
+        if attempts > 1 and probe not in self.inflight:
+            return None
+        dst = probe[0]
+        with self.lock:
+            queue = self.host_queues.get(dst)
+            if queue is not None:
+                # The host is already waiting, queue behind its earlier probes
+                queue.append((probe, attempts))
+                self.deferred += 1
+                return None
+        delay = self.host_delay(dst)
+        if delay > 0:
+            # Set aside, the sender moves on to the other hosts meanwhile
+            with self.lock:
+                self.host_queues[dst] = deque([(probe, attempts)])
+                self.deferred += 1
+                heapq.heappush(self.ready_hosts, (time.monotonic() + delay, dst))
+            return None
+        self._transmit(sender, probe, attempts)
+
+    def _listen(self, iface: str) -> None:
+        """Start capturing replies on `iface` unless already done."""
+        if iface in self.sniffers:
+            return None
+        started = threading.Event()
+        sniffer = AsyncSniffer(
+            iface=iface,
+            filter=self.bpf_filter(),
+            prn=self._receive,
+            store=False,
+            started_callback=started.set,
+        )
+        sniffer.start()
+        started.wait(self.timeout)
+        self.sniffers[iface] = sniffer
+
+    def _transmit(self, sender, probe: tuple, attempts: int) -> None:
+        # Replies come back on the interface the probe leaves from: loopback, a second NIC, a VPN...
+        self._listen(egress_interface(probe[0]))
+        packet = self.build_probe(*probe)
+        self.limiter.acquire()
+        sent_at = time.time()
+        with self.lock:
+            if attempts > 1 and probe not in self.inflight:
+                return None
+            self.inflight[probe] = (sent_at, attempts)
+            self.metrics.sent(attempts)
+            heapq.heappush(
+                self.deadlines, (sent_at + self.host_rtt(probe[0]).rto, sent_at, probe)
+            )
+        sender.send(packet, probe[0])
+
+    def _send_deferred(self, sender) -> None:
+        """Send the deferred probes of every host that is ready again, oldest first."""
+        now = time.monotonic()
+        while True:
+            with self.lock:
+                if not self.ready_hosts or self.ready_hosts[0][0] > now:
+                    return None
+                _, dst = heapq.heappop(self.ready_hosts)
+                queue = self.host_queues[dst]
+            while True:
+                delay = self.host_delay(dst)
+                if delay > 0:
+                    with self.lock:
+                        heapq.heappush(self.ready_hosts, (time.monotonic() + delay, dst))
+                    break
+                with self.lock:
+                    probe, attempts = queue.popleft()
+                    self.deferred -= 1
+                    if not queue:
+                        del self.host_queues[dst]
+                self._transmit(sender, probe, attempts)
+                if dst not in self.host_queues:
+                    break
+
+    def _wait_deferred(self, sender) -> None:
+        """Hold the sender back while more than `max_deferred` probes wait on their host."""
+        while self.deferred >= self.max_deferred and not self.cancelled.is_set():
+            self._expire(sender)
+            self.metrics.tick(self)
+            with self.lock:
+                ready_at = self.ready_hosts[0][0] if self.ready_hosts else 0
+            time.sleep(min(max(ready_at - time.monotonic(), 0), 0.01))
+
+    def _expire(self, sender) -> None:
+        """Retransmit or give up on every in-flight probe whose deadline has passed."""
+        self._send_deferred(sender)
+        now = time.time()
+        expired = []
+        with self.lock:
+            while self.deadlines and self.deadlines[0][0] <= now:
+                _, sent_at, probe = heapq.heappop(self.deadlines)
+                sent = self.inflight.get(probe)
+                # Skip deadlines of probes that were answered or resent since
+                if sent is None or sent[0] != sent_at:
+                    continue
+                expired.append((probe, sent_at, sent[1]))
+        for probe, sent_at, attempts in expired:
+            # Expired probes stay in flight until resent, so a checkpoint never drops them
+            with self.lock:
+                sent = self.inflight.get(probe)
+                if sent is None or sent[0] != sent_at:
+                    continue
+                if attempts > self.retries:
+                    del self.inflight[probe]
+                    self.metrics.timeouts += 1
+            self.on_timeout(probe)
+            if attempts <= self.retries:
+                self._send(sender, probe, attempts + 1)
+            else:
+                self._record(probe, self.timeout_state)
+
+    def pending_probes(self) -> list:
+        """Probes handed to the engine that have no result yet, for checkpoints."""
+        with self.lock:
+            pending = list(self.inflight)
+            pending += [
+                probe
+                for queue in self.host_queues.values()
+                for probe, _ in queue
+                if probe not in self.inflight
+            ]
+        if self.unsent is not None and self.unsent not in pending:
+            pending.append(self.unsent)
+        return pending
+
+    def scan(
+        self, probes, checkpoint=None, checkpoint_interval: float = 5, total: int = None
+    ) -> ResultSink:
+        """Send a probe to every (dst, port) and collect the replies.
+
+        Args:
+            probes (iterable): (dst, port) tuples to probe.
+            checkpoint (callable, optional): Called as checkpoint(self) from the sending thread every
+                `checkpoint_interval` seconds and on KeyboardInterrupt or cancel(), when every probe taken from
+                `probes` so far is either finished or listed by pending_probes().
+            checkpoint_interval (float, optional): Seconds between checkpoints. Defaults to 5.
+            total (int, optional): Number of probes for progress/ETA, when `probes` can't tell (generators).
+
+        Returns:
+            ResultSink: The sink every probe outcome was recorded into.
+        """
+        sender = open_sender()
+        self.metrics.start(total if total is not None else probe_count(probes))
+        next_checkpoint = time.monotonic() + checkpoint_interval
+        try:
+            for probe in probes:
+                self.unsent = probe
+                if self.cancelled.is_set():
+                    break
+                self._send(sender, probe, 1)
+                self.unsent = None
+                self._expire(sender)
+                self._wait_deferred(sender)
+                self.metrics.tick(self)
+                if checkpoint and time.monotonic() >= next_checkpoint:
+                    checkpoint(self)
+                    next_checkpoint = time.monotonic() + checkpoint_interval
+            while (self.inflight or self.deferred) and not self.cancelled.is_set():
+                self._expire(sender)
+                self.metrics.tick(self)
+                time.sleep(0.01)
+            self.metrics.tick(self, force=True)
+            if self.cancelled.is_set() and checkpoint:
+                checkpoint(self)
+        except KeyboardInterrupt:
+            if checkpoint:
+                checkpoint(self)
+            raise
+        finally:
+            sender.close()
+            for sniffer in self.sniffers.values():
+                sniffer.stop()
+            self.sniffers = {}
+        return self.sink
+
+
+class SynScanner(ProbeScanner):
+    """Batched TCP SYN scan engine.
+
+    Each probe carries a keyed cookie of (dst, dport) as its sequence number,
+    so SYN/ACK and RST replies are matched back to their probe by
+    (dst, dport, seq) without a lookup table. States are "open", "closed" and
+    "filtered".
+    """
+
+    protocol = "TCP"
+
+    def bpf_filter(self) -> str:
+        return f"(tcp and dst port {self.sport}) or icmp"
+
+    def build_probe(self, dst: str, port: int):
+        src = source_ip(dst)
+        if src not in self.templates:
+            self.templates[src] = ProbeTemplate(
+                IP(src=src, dst="0.0.0.0") / TCP(sport=self.sport, dport=0, flags="S")
+            )
+        return self.templates[src].render(dst, port, probe_cookie(self.secret, dst, port))
+
+    def classify(self, pkt):
+        if pkt.haslayer(ICMP):
+            if not (pkt.haslayer(TCPerror) and pkt[TCPerror].sport == self.sport):
+                return None
+            state = self.icmp_error_state(pkt)
+            if state is None:
+                return None
+            return (pkt[IPerror].dst, pkt[TCPerror].dport), state
+        if not (pkt.haslayer(IP) and pkt.haslayer(TCP)):
+            return None
+        probe = (pkt[IP].src, pkt[TCP].sport)
+        if (pkt[TCP].ack - 1) & 0xFFFFFFFF != probe_cookie(self.secret, *probe):
+            return None
+        flags = int(pkt[TCP].flags)
+        if flags & SYN_ACK == SYN_ACK:
+            return probe, "open"
+        if flags & RST:
+            return probe, "closed"
+        return None
+
+
+class UdpScanner(ProbeScanner):
+    """Batched UDP scan engine.
+
+    Ports are classified from what comes back: a UDP reply means "open", an
+    ICMP port-unreachable means "closed", any other unreachable means
+    "filtered", and silence after every retry leaves "open|filtered".
+    Well-known ports get a protocol payload (see udp_payloads) so their
+    services actually answer.
+
+    Hosts only emit a few ICMP unreachables per second, so every host also
+    gets its own AIMD limiter: a probe that times out on a host that has been
+    answering with unreachables counts as a rate-limit drop and slows that
+    host down. Probes to a host over its rate are set aside until it is ready
+    again (see host_delay), so the sender keeps probing the other hosts.
+    """
+
+    protocol = "UDP"
+    timeout_state = "open|filtered"
+
+    def __init__(self, *args, host_rate: float = 100, **kwargs):
+        """Initialize a UdpScanner object.
+
+        Args:
+            host_rate (float, optional): Starting (and maximum) probes per second to any one host. Defaults to 100.
+            Remaining arguments are passed to ProbeScanner.
+        """
+        super().__init__(*args, **kwargs)
+        self.host_rate = host_rate
+        self.host_limiters = {}
+        self.unreachable_hosts = set()
+
+    def host_limiter(self, dst: str) -> AimdRateLimiter:
+        if dst not in self.host_limiters:
+            self.host_limiters[dst] = AimdRateLimiter(
+                max_rate=self.host_rate, min_rate=1
+            )
+        return self.host_limiters[dst]
+
+    def bpf_filter(self) -> str:
+        return f"(udp and dst port {self.sport}) or icmp"
+
+    def build_probe(self, dst: str, port: int):
+        src = source_ip(dst)
+        payload = udp_payload(port)
+        # One template per distinct payload, the payload length changes the headers
+        if (src, payload) not in self.templates:
+            self.templates[(src, payload)] = ProbeTemplate(
+                IP(src=src, dst="0.0.0.0") / UDP(sport=self.sport, dport=0) / Raw(payload)
+            )
+        return self.templates[(src, payload)].render(dst, port)
+
+    def host_delay(self, dst: str) -> float:
+        return self.host_limiter(dst).try_acquire()
+
+    def on_timeout(self, probe: tuple) -> None:
+        if probe[0] in self.unreachable_hosts:
+            self.host_limiter(probe[0]).on_rate_limited()
+
+    def classify(self, pkt):
+        if pkt.haslayer(ICMP):
+            if not (pkt.haslayer(UDPerror) and pkt[UDPerror].sport == self.sport):
+                return None
+            probe = (pkt[IPerror].dst, pkt[UDPerror].dport)
+            if (
+                pkt[ICMP].type == ICMP_DEST_UNREACH
+                and pkt[ICMP].code == ICMP_PORT_UNREACH
+            ):
+                self.unreachable_hosts.add(probe[0])
+                self.host_limiter(probe[0]).on_reply()
+                return probe, "closed"
+            state = self.icmp_error_state(pkt)
+            if state is None:
+                return None
+            return probe, state
+        if not (pkt.haslayer(IP) and pkt.haslayer(UDP)):
+            return None
+        return (pkt[IP].src, pkt[UDP].sport), "open"
@@ -0,0 +1,179 @@
+from collections import deque
+import os
+import time
+
+# Seconds of history the pps and completion rates are averaged over
+RATE_WINDOW = 10
+
+
+def probe_count(probes):
+    """Number of probes an iterable will yield, or None when it can't be known up front."""
+    if hasattr(probes, "remaining"):
+        return probes.remaining()
+    if hasattr(probes, "__len__"):
+        return len(probes)
+    return None
+
+
+class ScanMetrics:
+    """Counters and gauges of one running ProbeScanner.
+
+    Counters only ever go up: probes sent (retransmits included), retransmits,
+    replies, timeouts (probes given up on after every retry) and results. The
+    gauges (in-flight probes, current rate limit, pps, ETA) are sampled every
+    `interval` seconds from the sending thread by tick(), which then hands a
+    snapshot to every subscribed callback (GUI progress bar, exporter...).
+
+    [EXAMPLE SNAPSHOT]:
+        {"proto": "TCP", "elapsed": 12.5, "probes_sent": 11890, "retransmits": 104,
+         "replies": 11702, "timeouts": 12, "results": 11714, "inflight": 72,
+         "rate_limit": 1000.0, "pps": 951.3, "total": 65535, "eta": 56.6}
+    """
+
+    # Snapshot keys that add up across shards, see merge_snapshots
+    SUMMED = (
+        "probes_sent", "retransmits", "replies", "timeouts", "results", "inflight", "rate_limit", "pps",
+    )
+
+    def __init__(self, callbacks=(), interval: float = 1, proto: str = None):
+        """Initialize a ScanMetrics object.
+
+        Args:
+            callbacks (iterable, optional): Called with every snapshot dict.
+            interval (float, optional): Seconds between snapshots. Defaults to 1.
+            proto (str, optional): Protocol label. Set by the scanner if not provided.
+        """
+        self.callbacks = list(callbacks)
+        self.interval = interval
+        self.proto = proto
+        self.probes_sent = 0
+        self.retransmits = 0
+        self.replies = 0
+        self.timeouts = 0
+        self.results = 0
+        self.total = None
+        self.started = None
+        self.next_tick = 0
+        self.samples = deque()
+        self.last = None
+
+    def subscribe(self, callback) -> None:
+        self.callbacks.append(callback)
+
+    def start(self, total: int = None) -> None:
+        """Reset the clock at the beginning of a scan of `total` probes (None if unknown)."""
+        self.total = total
+        self.started = time.monotonic()
+        self.next_tick = self.started + self.interval
+        self.samples.clear()
+        self.samples.append((self.started, self.probes_sent, self.results))
+
+    def sent(self, attempts: int) -> None:
+        self.probes_sent += 1
+        if attempts > 1:
+            self.retransmits += 1
+
+    def snapshot(self, scanner) -> dict:
+        """Current counters plus gauges read from `scanner`."""
+        now = time.monotonic()
+        self.samples.append((now, self.probes_sent, self.results))
+        while len(self.samples) > 2 and now - self.samples[0][0] > RATE_WINDOW:
+            self.samples.popleft()
+        then, probes_then, results_then = self.samples[0]
+        window = now - then
+        pps = (self.probes_sent - probes_then) / window if window > 0 else 0
+        result_rate = (self.results - results_then) / window if window > 0 else 0
+        eta = None
+        if self.total is not None and result_rate > 0:
+            eta = max(self.total - self.results, 0) / result_rate
+        self.last = {
+            "proto": self.proto,
+            "elapsed": round(now - self.started, 3) if self.started else 0,
+            "probes_sent": self.probes_sent,
+            "retransmits": self.retransmits,
+            "replies": self.replies,
+            "timeouts": self.timeouts,
+            "results": self.results,
+            "inflight": len(scanner.inflight),
+            "rate_limit": round(scanner.limiter.rate, 1),
+            "pps": round(pps, 1),
+            "total": self.total,
+            "eta": None if eta is None else round(eta, 1),
+        }
+        return self.last
+
+    def tick(self, scanner, force: bool = False) -> None:
+        """Publish a snapshot if `interval` has passed (or always with force)."""
+        if not self.callbacks or not (force or time.monotonic() >= self.next_tick):
+            return None
+        self.next_tick = time.monotonic() + self.interval
+        snapshot = self.snapshot(scanner)
+        for callback in self.callbacks:
+            callback(snapshot)
+
+
+def merge_snapshots(snapshots) -> dict:
+    """One snapshot for a sharded scan, from the latest snapshot of each shard.
+
+    Counters, in-flight probes, rate limits and pps add up; the ETA is the
+    slowest shard's. Totals and ETAs stay unknown while any shard's is.
+    """
+    snapshots = list(snapshots)
+    merged = {"proto": snapshots[0]["proto"], "elapsed": max(s["elapsed"] for s in snapshots)}
+    for key in ScanMetrics.SUMMED:
+        merged[key] = round(sum(snapshot[key] for snapshot in snapshots), 1)
+    for key, combine in (("total", sum), ("eta", max)):
+        values = [snapshot[key] for snapshot in snapshots]
+        merged[key] = None if None in values else combine(values)
+    return merged
+
+
+class PrometheusTextfile:
+    """ScanMetrics callback keeping a node_exporter textfile collector file up to date.
+
+    Point node_exporter's --collector.textfile.directory at the file's
+    directory; every snapshot rewrites the file atomically so the exporter
+    never reads it half written.
+    """
+
+    COUNTERS = ("probes_sent", "retransmits", "replies", "timeouts", "results")
+    # Snapshot key -> metric name
+    GAUGES = {
+        "inflight": "probes_inflight",
+        "rate_limit": "rate_limit_pps",
+        "pps": "pps",
+        "total": "probes_planned",
+        "eta": "eta_seconds",
+        "elapsed": "elapsed_seconds",
+    }
+
+    def __init__(self, path: str, prefix: str = "noc_scanner"):
+        """Initialize a PrometheusTextfile object.
+
+        Args:
+            path (str): Output file, should end in ".prom".
+            prefix (str, optional): Metric name prefix. Defaults to "noc_scanner".
+        """
+        self.path = path
+        self.prefix = prefix
+        # Latest snapshot of every protocol, so the UDP phase doesn't erase the TCP numbers
+        self.snapshots = {}
+
+    def render(self) -> str:
+        lines = []
+        metrics = [(f"{name}_total", name, "counter") for name in self.COUNTERS]
+        metrics += [(metric, name, "gauge") for name, metric in self.GAUGES.items()]
+        for metric, name, metric_type in metrics:
+            metric = f"{self.prefix}_{metric}"
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for proto, snapshot in self.snapshots.items():
+                if snapshot[name] is not None:
+                    lines.append(f'{metric}{{proto="{proto}"}} {snapshot[name]}')
+        return "\n".join(lines) + "\n"
+
+    def __call__(self, snapshot: dict) -> None:
+        self.snapshots[snapshot["proto"]] = snapshot
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as metrics_file:
+            metrics_file.write(self.render())
+        os.replace(temp_path, self.path)
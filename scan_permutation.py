@@ -0,0 +1,159 @@
+import hashlib
+import random
+
+# Deterministic Miller-Rabin witnesses, valid for every n < 3.3 * 10**24
+MR_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for witness in MR_WITNESSES:
+        if n % witness == 0:
+            return n == witness
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for witness in MR_WITNESSES:
+        x = pow(witness, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def next_prime(n: int) -> int:
+    candidate = max(n + 1, 3)
+    while not is_prime(candidate):
+        candidate += 1
+    return candidate
+
+
+def prime_factors(n: int) -> set:
+    factors = set()
+    factor = 2
+    while factor * factor <= n:
+        while n % factor == 0:
+            factors.add(factor)
+            n //= factor
+        factor += 1
+    if n > 1:
+        factors.add(n)
+    return factors
+
+
+class CyclicPermutation:
+    """Lazy random permutation of range(size) using a cyclic group walk.
+
+    The multiplicative group modulo a prime p > size is cyclic, so repeatedly
+    multiplying by a primitive root g visits every value 1..p-1 exactly once.
+    Values past size are skipped. Only (p, g, start) is kept in memory, no
+    matter how large size is, and `position` (steps walked so far) is all it
+    takes to resume the walk later with the same seed.
+    """
+
+    def __init__(self, size: int, seed: int = None, position: int = 0, stop: int = None):
+        """Initialize a CyclicPermutation object.
+
+        Args:
+            size (int): Number of elements to permute.
+            seed (int, optional): Seed for the generator and start point. A random one is used if not provided.
+            position (int, optional): Number of steps already walked, to resume a previous walk. Defaults to 0.
+            stop (int, optional): Step to stop the walk at, to split it into shards. Defaults to the full walk.
+        """
+        self.size = size
+        self.position = position
+        self.prime = next_prime(size)
+        self.steps = self.prime - 1
+        self.stop = self.steps if stop is None else min(stop, self.steps)
+        rng = random.Random(seed)
+        factors = prime_factors(self.prime - 1)
+        while True:
+            generator = rng.randrange(2, self.prime) if self.prime > 3 else 2
+            if all(pow(generator, (self.prime - 1) // q, self.prime) != 1 for q in factors):
+                break
+        self.generator = generator
+        self.start = rng.randrange(1, self.prime)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        x = self.start * pow(self.generator, self.position, self.prime) % self.prime
+        while self.position < self.stop:
+            value = x
+            x = x * self.generator % self.prime
+            self.position += 1
+            if value <= self.size:
+                yield value - 1
+
+
+class ProbePermutation:
+    """Every (host, port) pair of hosts x ports in a randomized, resumable order.
+
+    Consecutive probes land on different hosts, so no single target is hammered
+    with its whole port range in sequence. `position` only advances past a
+    probe once it has been handed out, so (seed, position) is a scan cursor.
+    """
+
+    def __init__(self, hosts, ports, seed: int = None, position: int = 0, stop: int = None):
+        """Initialize a ProbePermutation object.
+
+        Args:
+            hosts (sequence): Indexable collection of target IPs (list, ipaddress network, ...).
+            ports (sequence): Indexable collection of ports (list, range, ...).
+            seed (int, optional): Seed for the permutation. A random one is picked if not provided.
+            position (int, optional): Cursor of a previous walk to resume from. Defaults to 0.
+            stop (int, optional): Cursor to stop at, see shards(). Defaults to the full walk.
+        """
+        self.hosts = hosts
+        self.ports = ports
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.walk = CyclicPermutation(len(hosts) * len(ports), self.seed, position, stop)
+
+    @property
+    def position(self) -> int:
+        return self.walk.position
+
+    def shards(self, count: int) -> list:
+        """Split the walk into `count` contiguous (position, stop) cursor ranges.
+
+        Every range is itself a random spread over all hosts, and together they
+        cover each probe exactly once.
+        """
+        start, steps = self.walk.position, self.walk.stop
+        bounds = [start + (steps - start) * shard // count for shard in range(count + 1)]
+        return list(zip(bounds, bounds[1:]))
+
+    def remaining(self) -> int:
+        """Approximate number of probes still to come (the walk skips values past the end)."""
+        walk = self.walk
+        return round(max(walk.stop - walk.position, 0) * walk.size / walk.steps)
+
+    def __iter__(self):
+        num_hosts = len(self.hosts)
+        for index in self.walk:
+            yield str(self.hosts[index % num_hosts]), self.ports[index // num_hosts]
+
+
+def probe_cookie(secret: bytes, dst: str, port: int) -> int:
+    """32-bit sequence number identifying a probe, verifiable without stored state.
+
+    Args:
+        secret (bytes): Per-scan secret key.
+        dst (str): Target IP of the probe.
+        port (int): Target port of the probe.
+
+    Returns:
+        int: Sequence number to send. Replies acknowledge cookie + 1.
+    """
+    digest = hashlib.blake2b(
+        f"{dst}:{port}".encode(), key=secret, digest_size=4
+    ).digest()
+    return int.from_bytes(digest, "big")
@@ -0,0 +1,128 @@
+from port_bitmaps import PortBitmaps
+from collections import Counter, deque, namedtuple
+import csv
+import json
+import os
+import threading
+
+ScanRecord = namedtuple("ScanRecord", ["host", "port", "proto", "state", "rtt"])
+
+
+class ResultSink:
+    """Thread-safe scan result store streaming records to JSONL/CSV as they arrive.
+
+    Nothing grows with the number of probes: every record is written out
+    immediately, and memory only holds per (proto, state) counters, a ring of
+    the most recent records for partial views (GUI) and the open ports found,
+    as one port bitmap per (host, proto).
+    """
+
+    def __init__(self, path: str = None, recent: int = 1000, callbacks=()):
+        """Initialize a ResultSink object.
+
+        Args:
+            path (str, optional): File to stream records to. ".csv" files get CSV, anything else JSONL.
+                Records are only kept in memory if not provided.
+            recent (int, optional): How many of the latest records to keep for snapshots. Defaults to 1000.
+            callbacks (iterable, optional): Called with every ScanRecord as it is added.
+        """
+        self.path = path
+        self.recent = deque(maxlen=recent)
+        self.open_bitmaps = PortBitmaps()
+        self.counts = Counter()
+        self.callbacks = list(callbacks)
+        self.lock = threading.Lock()
+        self.file = None
+        self.csv_writer = None
+        if path:
+            write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+            # Line buffered, so every record reaches the disk while the scan runs
+            self.file = open(path, "a", newline="", buffering=1)
+            if path.endswith(".csv"):
+                self.csv_writer = csv.writer(self.file)
+                if write_header:
+                    self.csv_writer.writerow(ScanRecord._fields)
+
+    def subscribe(self, callback) -> None:
+        self.callbacks.append(callback)
+
+    def add(self, host: str, port: int, proto: str, state: str, rtt: float = None) -> ScanRecord:
+        """Record one probe outcome.
+
+        Args:
+            host (str): Target IP.
+            port (int): Target port.
+            proto (str): "TCP" or "UDP".
+            state (str): "open", "closed", "filtered", "open|filtered"...
+            rtt (float, optional): Round trip time in seconds, when the probe was answered.
+
+        Returns:
+            ScanRecord: The stored record.
+        """
+        record = ScanRecord(host, port, proto, state, None if rtt is None else round(rtt, 6))
+        with self.lock:
+            self.counts[(proto, state)] += 1
+            self.recent.append(record)
+            if state == "open":
+                self.open_bitmaps.add(host, port, proto)
+            if self.csv_writer:
+                self.csv_writer.writerow(record)
+            elif self.file:
+                self.file.write(json.dumps(record._asdict()) + "\n")
+        for callback in self.callbacks:
+            callback(record)
+        return record
+
+    @property
+    def open_ports(self) -> list:
+        """Open ports found so far as ScanRecords (without RTT, see the output file for those)."""
+        with self.lock:
+            return [
+                ScanRecord(host, port, proto, "open", None)
+                for host, port, proto in self.open_bitmaps.items()
+            ]
+
+    def restore(self, open_ports, counts) -> None:
+        """Reload the in-memory state of a previous run (see scan_checkpoint)."""
+        with self.lock:
+            for record in open_ports:
+                record = ScanRecord(*record)
+                self.open_bitmaps.add(record.host, record.port, record.proto)
+            for proto, state, count in counts:
+                self.counts[(proto, state)] += count
+
+    def snapshot(self) -> list:
+        """Copy of the most recent records, safe to hand to another thread."""
+        with self.lock:
+            return list(self.recent)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+                self.csv_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_results(path: str):
+    """Stream ScanRecords back from a JSONL or CSV results file."""
+    with open(path, newline="") as results_file:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(results_file):
+                yield ScanRecord(
+                    row["host"],
+                    int(row["port"]),
+                    row["proto"],
+                    row["state"],
+                    float(row["rtt"]) if row["rtt"] else None,
+                )
+        else:
+            for line in results_file:
+                if line.strip():
+                    yield ScanRecord(**json.loads(line))
@@ -0,0 +1,133 @@
+from scan_engine import SynScanner, UdpScanner
+from scan_permutation import ProbePermutation
+from scan_results import ResultSink
+from scan_metrics import ScanMetrics, merge_snapshots
+import multiprocessing
+import os
+import queue
+import time
+
+SCANNERS = {"TCP": SynScanner, "UDP": UdpScanner}
+# Records buffered between the workers and the merging parent
+QUEUE_SIZE = 10000
+
+
+def scan_shard(proto, hosts, ports, seed, start, stop, rate, results, shard, metrics_interval) -> None:
+    """Worker process: scan one cursor range of the permutation with its own sender/receiver.
+
+    Records go back to the parent as they are, metrics snapshots (every
+    `metrics_interval` seconds, none if None) as dicts tagged with `shard`.
+    """
+    sink = ResultSink(callbacks=[results.put])
+    metrics = None
+    if metrics_interval:
+        metrics = ScanMetrics(
+            [lambda snapshot: results.put(dict(snapshot, shard=shard))], metrics_interval
+        )
+    try:
+        SCANNERS[proto](rate=rate, sink=sink, metrics=metrics).scan(
+            ProbePermutation(hosts, ports, seed, start, stop)
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        results.put(None)
+
+
+def sharded_scan(
+    proto: str,
+    hosts: list,
+    ports,
+    rate: float,
+    sink: ResultSink,
+    workers: int = None,
+    cancelled=None,
+    telemetry=(),
+    metrics_interval: float = 5,
+) -> ResultSink:
+    """Scan hosts x ports across a pool of processes.
+
+    The seeded probe permutation is cut into one contiguous cursor range per
+    worker, so the shards never overlap and each one still spreads over all
+    hosts. Every worker runs its own ProbeScanner (own raw socket, sniffer and
+    source port) off the GIL of the others, and streams its records back to
+    this process, which is the only writer of `sink`. Worker metrics come
+    back the same way and are merged into one snapshot for `telemetry`.
+
+    A worker that dies without finishing (OOM, signal, crash) is reported once
+    every other worker is done, and its shard is left incomplete.
+
+    Args:
+        proto (str): "TCP" or "UDP".
+        hosts (list): Target IPs.
+        ports (sequence): Ports to probe on every host.
+        rate (float): Total packets per second, split evenly between workers.
+        sink (ResultSink): Where the merged results are recorded.
+        workers (int, optional): Number of processes. Defaults to the number of CPUs.
+        cancelled (threading.Event, optional): Terminates the workers once set.
+        telemetry (iterable, optional): Called with the merged ScanMetrics snapshot of all workers.
+        metrics_interval (float, optional): Seconds between snapshots. Defaults to 5.
+
+    Returns:
+        ResultSink: sink
+    """
+    workers = workers or os.cpu_count() or 1
+    permutation = ProbePermutation(hosts, ports)
+    results = multiprocessing.Queue(QUEUE_SIZE)
+    telemetry = list(telemetry)
+    processes = [
+        multiprocessing.Process(
+            target=scan_shard,
+            args=(
+                proto, hosts, ports, permutation.seed, start, stop, rate / workers, results,
+                shard, metrics_interval if telemetry else None,
+            ),
+            daemon=True,
+        )
+        for shard, (start, stop) in enumerate(permutation.shards(workers))
+    ]
+    for process in processes:
+        process.start()
+    snapshots = {}
+    next_report = time.monotonic() + metrics_interval
+    try:
+        finished = 0
+        while finished < workers:
+            if cancelled is not None and cancelled.is_set():
+                for process in processes:
+                    process.terminate()
+                break
+            try:
+                record = results.get(timeout=0.1)
+            except queue.Empty:
+                # Finished workers flush their queue before exiting, so nothing more can come
+                if not any(process.is_alive() for process in processes):
+                    exit_codes = [process.exitcode for process in processes]
+                    print(
+                        f"[ERROR]: {workers - finished} {proto} scan worker(s) died before finishing "
+                        f"(exit codes {exit_codes}), their shards are incomplete"
+                    )
+                    break
+                continue
+            if record is None:
+                finished += 1
+            elif isinstance(record, dict):
+                snapshots[record.pop("shard")] = record
+                # Merged once every shard has reported, so totals cover the whole scan
+                if len(snapshots) == workers and time.monotonic() >= next_report:
+                    next_report = time.monotonic() + metrics_interval
+                    for callback in telemetry:
+                        callback(merge_snapshots(snapshots.values()))
+            else:
+                sink.add(*record)
+        if snapshots:
+            for callback in telemetry:
+                callback(merge_snapshots(snapshots.values()))
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+    return sink
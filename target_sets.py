@@ -0,0 +1,168 @@
+from bisect import bisect_right
+import ipaddress
+import os
+
+
+def parse_interval(item: str, hosts_only: bool = True) -> tuple:
+    """Integer bounds (first, last) of one target item.
+
+    Accepted items are single IPs ("10.0.0.1"), CIDRs ("10.0.0.0/24"), full
+    ranges ("10.0.0.1-10.0.0.50") and last-octet ranges ("10.0.0.1-50").
+    IPv4 only, like the raw scan engines.
+
+    Args:
+        item (str): One target item.
+        hosts_only (bool, optional): Leave the network and broadcast addresses out of CIDRs. Defaults to True.
+
+    Raises:
+        ValueError: The item is not a valid IPv4 target.
+    """
+    if "/" in item:
+        network = ipaddress.IPv4Network(item, strict=False)
+        first, last = int(network.network_address), int(network.broadcast_address)
+        if hosts_only and network.num_addresses > 2:
+            first, last = first + 1, last - 1
+        return first, last
+    if "-" in item:
+        first, last = item.split("-", 1)
+        first = ipaddress.IPv4Address(first.strip())
+        last = last.strip()
+        if last.isdigit():
+            last = ipaddress.IPv4Address(str(first).rsplit(".", 1)[0] + "." + last)
+        else:
+            last = ipaddress.IPv4Address(last)
+        if last < first:
+            raise ValueError(f"{item} ends before it starts")
+        return int(first), int(last)
+    address = int(ipaddress.IPv4Address(item))
+    return address, address
+
+
+def merge_intervals(intervals) -> list:
+    """Sort and merge overlapping or adjacent (first, last) intervals."""
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def subtract_intervals(included: list, excluded: list) -> list:
+    """Merged intervals of `included` minus `excluded`, in one sweep over both sorted lists."""
+    result = []
+    index = 0
+    for first, last in included:
+        while index < len(excluded) and excluded[index][1] < first:
+            index += 1
+        cursor = first
+        scan = index
+        while scan < len(excluded) and excluded[scan][0] <= last:
+            excluded_first, excluded_last = excluded[scan]
+            if excluded_first > cursor:
+                result.append((cursor, excluded_first - 1))
+            cursor = max(cursor, excluded_last + 1)
+            scan += 1
+        if cursor <= last:
+            result.append((cursor, last))
+    return result
+
+
+class TargetSet:
+    """Scan targets as sorted, merged integer intervals of IPv4 addresses.
+
+    Includes and excludes are merged into disjoint [first, last] intervals
+    once, so setup only costs a sort of the specification items: a /8 minus
+    thousands of excluded subnets is a few thousand intervals, not millions
+    of addresses. Membership and indexing are bisects over the interval
+    bounds and iteration is lazy, so a TargetSet can stand in for the host
+    list of a ProbePermutation.
+
+    [EXAMPLE]:
+        targets = TargetSet.parse("10.0.0.0/8, !10.20.0.0/16", exclude="10.99.1.1-10.99.1.50")
+        "10.20.1.1" in targets  # False
+        len(targets)            # 16711628
+        targets[0]              # "10.0.0.1"
+    """
+
+    def __init__(self, include=(), exclude=()):
+        """Initialize a TargetSet object.
+
+        Args:
+            include (iterable, optional): (first, last) integer intervals to scan.
+            exclude (iterable, optional): (first, last) integer intervals never to scan.
+        """
+        self.intervals = subtract_intervals(
+            merge_intervals(include), merge_intervals(exclude)
+        )
+        self.starts = [first for first, _ in self.intervals]
+        # offsets[i]: number of addresses in the intervals before interval i
+        self.offsets = []
+        total = 0
+        for first, last in self.intervals:
+            self.offsets.append(total)
+            total += last - first + 1
+        self.size = total
+
+    @classmethod
+    def parse(cls, spec: str, exclude: str = "") -> "TargetSet":
+        """Build a TargetSet from comma separated target items.
+
+        Items prefixed with "!" are exclusions, as is every item of `exclude`.
+        Invalid items are reported and skipped.
+
+        Args:
+            spec (str): Target specification provided by the user.
+            exclude (str, optional): More items to leave out, comma or newline separated.
+        """
+        include = []
+        excluded = []
+        items = [item.strip() for item in spec.split(",")]
+        items += ["!" + item.strip() for item in exclude.replace("\n", ",").split(",")]
+        for item in items:
+            is_exclusion = item.startswith("!")
+            item = item.lstrip("!").strip()
+            if not item or item.startswith("#"):
+                continue
+            try:
+                # Excluded subnets go as a whole, network and broadcast addresses included
+                interval = parse_interval(item, hosts_only=not is_exclusion)
+            except ValueError:
+                print(f"The provided target [{item}] is not valid.")
+                continue
+            (excluded if is_exclusion else include).append(interval)
+        return cls(include, excluded)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, address) -> bool:
+        try:
+            value = int(ipaddress.IPv4Address(address))
+        except ValueError:
+            return False
+        index = bisect_right(self.starts, value) - 1
+        return index >= 0 and value <= self.intervals[index][1]
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("TargetSet index out of range")
+        interval = bisect_right(self.offsets, index) - 1
+        return str(ipaddress.IPv4Address(self.starts[interval] + index - self.offsets[interval]))
+
+    def __iter__(self):
+        for first, last in self.intervals:
+            for value in range(first, last + 1):
+                yield str(ipaddress.IPv4Address(value))
+
+
+def read_exclude(value: str) -> str:
+    """Exclusion items from a file (one or more per line, # comments), or the value itself."""
+    if value and os.path.isfile(value):
+        with open(value) as exclude_file:
+            return ",".join(line.split("#", 1)[0].strip() for line in exclude_file)
+    return value or ""
@@ -0,0 +1,62 @@
+### Protocol specific UDP probe payloads.
+### Most UDP services silently drop an empty datagram, so a port only answers
+### (and can be reported open) when it is sent a request it understands.
+
+# DNS standard query: root NS
+DNS_QUERY = bytes.fromhex("123401000001000000000000" "0000020001")
+
+# NTP v3 client mode request
+NTP_REQUEST = b"\xe3" + b"\x00" * 47
+
+# SNMPv1 get-request, community "public", OID sysDescr.0 (1.3.6.1.2.1.1.1.0)
+SNMP_GET = bytes.fromhex(
+    "3029"  # SEQUENCE
+    "020100"  # version: 1
+    "04067075626c6963"  # community: public
+    "a01c"  # get-request PDU
+    "02044e4f4330"  # request-id
+    "020100"  # error-status
+    "020100"  # error-index
+    "300e300c06082b060102010101000500"  # varbind: sysDescr.0 = NULL
+)
+
+# NetBIOS name service node status request for "*"
+NETBIOS_NS_STATUS = (
+    b"\x80\xf0\x00\x10\x00\x01\x00\x00\x00\x00\x00\x00"
+    b"\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00\x00\x21\x00\x01"
+)
+
+# mDNS query: _services._dns-sd._udp.local PTR
+MDNS_QUERY = bytes.fromhex(
+    "000000000001000000000000"
+    "095f7365727669636573075f646e732d7364045f756470056c6f63616c00000c0001"
+)
+
+SSDP_MSEARCH = (
+    b"M-SEARCH * HTTP/1.1\r\n"
+    b"HOST: 239.255.255.250:1900\r\n"
+    b'MAN: "ssdp:discover"\r\n'
+    b"MX: 1\r\n"
+    b"ST: ssdp:all\r\n\r\n"
+)
+
+TFTP_READ = b"\x00\x01noc_scanner\x00octet\x00"
+
+# memcached UDP frame header + "stats"
+MEMCACHED_STATS = b"\x00\x01\x00\x00\x00\x01\x00\x00stats\r\n"
+
+udp_payloads = {
+    53: DNS_QUERY,
+    69: TFTP_READ,
+    123: NTP_REQUEST,
+    137: NETBIOS_NS_STATUS,
+    161: SNMP_GET,
+    1900: SSDP_MSEARCH,
+    5353: MDNS_QUERY,
+    11211: MEMCACHED_STATS,
+}
+
+
+def udp_payload(port: int) -> bytes:
+    """Payload to send to a UDP port, empty when no protocol probe is known."""
+    return udp_payloads.get(port, b"")